@@ -145,10 +145,11 @@ class SynthesizeNode:
         
         model_callback = None
         if self.stream_callback:
-            # Use the actual model name if possible, fallback to synthesis_agent
+            # Synthesis chunks are the user-facing answer, so emit them as a
+            # dedicated event type the UI can render into its Final Answer panel
             model_label = getattr(self.synthesis_agent, "model_name", "synthesis_agent").replace(":", "_")
             def callback(chunk: str):
-                self.stream_callback("model_response", model_label, chunk)
+                self.stream_callback("final_answer", model_label, chunk)
             model_callback = callback
         
         answer = self.synthesis_agent.synthesize_answer(
@@ -1,5 +1,6 @@
 """LangGraph workflow for pentest agent."""
 
+from functools import cached_property
 from typing import Dict, Any, TypedDict, List, Optional, Callable
 from langgraph.graph import StateGraph, END
 from models.generic_ollama_agent import GenericOllamaAgent
@@ -109,7 +110,6 @@ class PentestGraph:
         """Initialize managers and services."""
         self.executor = get_executor()
         self.results_storage = ToolResultsStorage()
-        self.conversation_retriever = ConversationRetriever()
         self.search_aggregator = SearchAggregator()
         self.memory_manager = get_memory_manager()
         self.memory_manager = get_memory_manager()
@@ -313,6 +313,11 @@ class PentestGraph:
             state["search_results"] = self.search_aggregator.search_multiple_queries(queries)
         return state
     
+    @cached_property
+    def conversation_retriever(self) -> ConversationRetriever:
+        """Conversation RAG retriever, built on the first retrieval."""
+        return ConversationRetriever()
+    
     def _knowledge_lookup_node(self, state: GraphState) -> GraphState:
         state["knowledge_results"] = {}
         return state
@@ -714,6 +714,7 @@ Extract parameters from context and execute the tool."""
         """Worker to consume tasks from Durable Scanning Queue."""
         results = []
         while True:
+            # One task per claim so the MAX_CONCURRENT_TOOLS workers share the queue
             task = self.memory_manager.scanning_queue.claim_task(self.memory_manager.conversation_id)
             if not task:
                 break
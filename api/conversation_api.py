@@ -1,6 +1,7 @@
 """Conversation management API for production memory architecture."""
 
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from memory.conversation_store import ConversationStore
 from memory.namespace_manager import NamespaceManager
 from memory.manager import MemoryManager
@@ -9,6 +10,10 @@ from memory.manager import MemoryManager
 class ConversationAPI:
     """API for conversation management and switching."""
     
+    # Listing results are reused for a short time unless conversation data changes
+    LIST_CACHE_TTL = 2.0
+    LIST_CACHE_MAXSIZE = 8
+    
     def __init__(self, memory_manager: Optional[MemoryManager] = None):
         """Initialize conversation API.
         
@@ -18,6 +23,8 @@ class ConversationAPI:
         self.conversation_store = ConversationStore()
         self.namespace_manager = NamespaceManager()
         self.memory_manager = memory_manager
+        # (limit, offset, fields) -> (cached_at, write_version, result)
+        self._list_cache: Dict[Tuple, Tuple[float, int, Dict[str, Any]]] = {}
     
     def create_conversation(self, title: Optional[str] = None, target_domain: Optional[str] = None) -> Dict[str, Any]:
         """Create new conversation.
@@ -29,14 +36,11 @@ class ConversationAPI:
         Returns:
             Conversation metadata dict
         """
-        conversation_id = self.conversation_store.create_conversation(title=title)
-        
-        # Update verified target if provided
-        if target_domain:
-            self.conversation_store.update_verified_target(conversation_id, target_domain)
-        
-        # Get created conversation
-        conversation = self.conversation_store.get_conversation(conversation_id)
+        # Target and full row in the INSERT itself (no update + re-read)
+        conversation = self.conversation_store.create_conversation_record(
+            title=title, verified_target=target_domain or None
+        )
+        conversation_id = conversation["id"]
         
         return {
             "success": True,
@@ -44,23 +48,38 @@ class ConversationAPI:
             "conversation": conversation
         }
     
-    def list_conversations(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    def list_conversations(self,
+                           limit: int = 50,
+                           offset: int = 0,
+                           fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """List all conversations.
         
         Args:
             limit: Maximum number of conversations to return
             offset: Offset for pagination
+            fields: Optional column projection (see ConversationStore.CONVERSATION_COLUMNS)
             
         Returns:
             Dictionary with conversations list
         """
-        conversations = self.conversation_store.list_conversations(limit=limit, offset=offset)
+        key = (limit, offset, tuple(fields) if fields else None)
+        now = time.monotonic()
+        version = ConversationStore.write_version()
+        cached = self._list_cache.get(key)
+        if cached and cached[1] == version and now - cached[0] < self.LIST_CACHE_TTL:
+            return cached[2]
         
-        return {
+        conversations = self.conversation_store.list_conversations(limit=limit, offset=offset, fields=fields)
+        
+        result = {
             "success": True,
             "conversations": conversations,
             "count": len(conversations)
         }
+        if len(self._list_cache) >= self.LIST_CACHE_MAXSIZE:
+            self._list_cache.clear()
+        self._list_cache[key] = (now, version, result)
+        return result
     
     def get_conversation(self, conversation_id: str) -> Dict[str, Any]:
         """Get conversation details.
@@ -71,21 +90,19 @@ class ConversationAPI:
         Returns:
             Dictionary with conversation details
         """
-        conversation = self.conversation_store.get_conversation(conversation_id)
+        # Metadata and message count in one round trip
+        bundle = self.conversation_store.get_conversation_bundle(conversation_id, k=0)
         
-        if not conversation:
+        if not bundle:
             return {
                 "success": False,
                 "error": f"Conversation {conversation_id} not found"
             }
         
-        # Get message count
-        message_count = self.conversation_store.get_message_count(conversation_id)
-        
         return {
             "success": True,
-            "conversation": conversation,
-            "message_count": message_count
+            "conversation": bundle["conversation"],
+            "message_count": bundle["message_count"]
         }
     
     def switch_conversation(self, conversation_id: str, memory_manager: Optional[MemoryManager] = None) -> Dict[str, Any]:
@@ -109,6 +126,7 @@ class ConversationAPI:
         try:
             # Switch conversation in memory manager
             mgr.switch_conversation(conversation_id)
+            self._list_cache.clear()
             
             # Get conversation context
             context = self.namespace_manager.load_conversation_context(conversation_id)
@@ -179,19 +197,26 @@ class ConversationAPI:
                 "error": str(e)
             }
     
-    def get_conversation_messages(self, conversation_id: str, limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
+    def get_conversation_messages(self,
+                                  conversation_id: str,
+                                  limit: Optional[int] = None,
+                                  offset: int = 0,
+                                  after_sequence: Optional[int] = None) -> Dict[str, Any]:
         """Get messages for a conversation.
         
         Args:
             conversation_id: Conversation UUID
             limit: Maximum number of messages (None for all)
             offset: Offset for pagination
+            after_sequence: Keyset cursor; only messages after this sequence_number
             
         Returns:
             Dictionary with messages
         """
         try:
-            messages = self.conversation_store.get_messages(conversation_id, limit=limit, offset=offset)
+            messages = self.conversation_store.get_messages(
+                conversation_id, limit=limit, offset=offset, after_sequence=after_sequence
+            )
             return {
                 "success": True,
                 "conversation_id": conversation_id,
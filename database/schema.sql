@@ -11,7 +11,14 @@ CREATE TABLE IF NOT EXISTS conversations (
     metadata JSONB DEFAULT '{}'::jsonb,
     summary TEXT,  -- Compressed summary of old messages
     session_id TEXT UNIQUE,  -- Legacy session_id for migration compatibility
-    verified_target TEXT  -- Verified target domain for this conversation
+    verified_target TEXT,  -- Verified target domain for this conversation
+    -- Structured verified target info (see ConversationStore.update_verified_target)
+    verified_target_legal_name TEXT,
+    verified_target_country TEXT,
+    verified_target_asn TEXT,
+    verified_target_ip_ranges TEXT[],
+    verified_target_confidence REAL,
+    message_count INTEGER DEFAULT 0  -- Maintained by ConversationStore.add_message(s)
 );
 
 -- Conversation messages (full history buffer)
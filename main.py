@@ -2,31 +2,122 @@
 
 import sys
 import uuid
+import argparse
+import asyncio
+import threading
 import os
-import io
-from typing import Optional
+import re
+import logging
+import traceback
+from typing import Optional, Dict, Any, Iterator, List, Callable, Tuple
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.text import Text
 
 from agents.pentest_graph import PentestGraph
-from rag.retriever import ConversationRetriever
-from rag.results_storage import ToolResultsStorage
 from ui.streaming_manager import StreamingManager
 from utils.input_normalizer import InputNormalizer
+from utils.normalize_cache import NormalizeCache
 from websearch.aggregator import SearchAggregator
 from api.conversation_api import ConversationAPI
+from memory.manager import get_memory_manager
+from models.generic_ollama_agent import GenericOllamaAgent
+from models.tool_calling_registry import get_tool_calling_registry
+from agents.autonomy_controller import get_autonomy_controller, AutonomyLevel, LEVEL_DESCRIPTIONS
+from utils.ollama_helper import get_model_names
+
+# Multi-agent model selection is optional; without it every agent shares one model
+try:
+    from utils.model_selector import MultiAgentModelSelector
+except ImportError:
+    MultiAgentModelSelector = None
 
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
-if hasattr(sys.stdin, 'buffer'):
+# Optional faster event loop for the per-turn graph event pump (not available on Windows)
+if sys.platform != "win32":
     try:
-        if sys.stdin.encoding != 'utf-8':
-            sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+_STDIN_WRAPPED = False
+
+
+def _ensure_utf8_stdin():
+    """Switch stdin to UTF-8 with replacement of undecodable bytes, once per process.
+    
+    Reconfigures in place so already-buffered input is not lost. Prompt
+    failures later fall back to input() without touching stdin again.
+    """
+    global _STDIN_WRAPPED
+    if _STDIN_WRAPPED:
+        return
+    _STDIN_WRAPPED = True
+    try:
+        sys.stdin.reconfigure(encoding='utf-8', errors='replace')
     except (AttributeError, ValueError):
         pass
 
+
+_ensure_utf8_stdin()
+
 console = Console()
+# Named explicitly because __name__ is "__main__" when run as a script
+logger = logging.getLogger("firestarter.main")
+
+# Domain-like or IPv4-like tokens; prompts without either skip input normalization
+_HAS_TARGET_RE = re.compile(r"[a-z0-9-]+\.[a-z]{2,}|\b\d{1,3}(?:\.\d{1,3}){3}\b", re.IGNORECASE)
+# Hostname-like tokens; only these need web-search DNS verification (bare IPs do not)
+_DOMAIN_HINT_RE = re.compile(r"\b[\w-]+\.[a-z]{2,24}\b", re.IGNORECASE)
+_RICH_MARKUP_RE = re.compile(r'\[[^\]]*\]')
+_DEFAULT_PROMPT = "You"
+_EXIT_WORDS = frozenset({"exit", "quit", "q"})
+_APPROVAL_WORDS = frozenset({"yes", "y", "approve", "ok", "okay"})
+
+# Only these columns are rendered by the conversation listings
+_LISTING_FIELDS = ("id", "title", "updated_at")
+
+# Fixed panel content is parsed once at import instead of on every render
+_WELCOME_PANEL = Panel.fit(
+    Text.from_markup(
+        "[bold cyan]AI Pentest Agent Multi-Model[/bold cyan]\n"
+        "Ollama, AutoGen, LangGraph, LlamaIndex, RAG\n"
+        "[dim]With Live Streaming & Typo Handling[/dim]"
+    ),
+    border_style="cyan"
+)
+_NO_ANSWER = "No answer was generated. Please try again."
+_FINAL_PANEL_KW = {
+    "title": Text.from_markup("[bold blue]Final Answer[/bold blue]"),
+    "border_style": "blue"
+}
+
+
+def _stdin_fallback(plain_prompt: str, default: Optional[str] = None) -> str:
+    """Read a line with plain input() when the Rich prompt cannot be used.
+    
+    Args:
+        plain_prompt: Prompt text with Rich markup already stripped
+        default: Default value if user just presses Enter
+        
+    Returns:
+        User input string, or the default (empty string if none) on failure
+        
+    Raises:
+        KeyboardInterrupt: Re-raised to allow graceful exit handling
+    """
+    try:
+        if default:
+            result = input(f"{plain_prompt} (default: {default}): ").strip()
+            return result if result else default
+        return input(f"{plain_prompt}: ").strip()
+    except KeyboardInterrupt:
+        raise
+    except Exception:
+        return default if default else ""
 
 
 def safe_prompt_ask(prompt_text: str, default: Optional[str] = None) -> str:
@@ -43,129 +134,452 @@ def safe_prompt_ask(prompt_text: str, default: Optional[str] = None) -> str:
         KeyboardInterrupt: Re-raised to allow graceful exit handling
     """
     # Strip Rich markup for plain text fallback
-    import re
-    plain_prompt = re.sub(r'\[.*?\]', '', prompt_text).strip()
-    if not plain_prompt:
-        plain_prompt = "You"
+    plain_prompt = _RICH_MARKUP_RE.sub('', prompt_text).strip() or _DEFAULT_PROMPT
     
     try:
         result = Prompt.ask(prompt_text, default=default)
         return str(result) if result is not None else ""
     except KeyboardInterrupt:
         raise
-    except (UnicodeDecodeError, UnicodeError) as e:
+    except Exception:
+        # Covers UnicodeDecodeError as well as any other prompt failure
+        return _stdin_fallback(plain_prompt, default)
+
+
+def _iter_corrections(normalized: Dict[str, Any]) -> Iterator[str]:
+    """Yield human-readable corrections made by the input normalizer.
+
+    Args:
+        normalized: Result dict from InputNormalizer.normalize_input
+
+    Yields:
+        One formatted string per correction
+    """
+    corrected_tools = normalized.get("corrected_tools") or {}
+    corrected_targets = normalized.get("corrected_targets") or {}
+    normalized_targets = normalized.get("normalized_targets")
+    # Common case (including the no-target fast path): nothing was corrected
+    if not (corrected_tools or corrected_targets or normalized_targets):
+        return
+    targets = normalized.get("targets") or []
+
+    for old, new in corrected_tools.items():
+        yield f"Tool '{old}' → '{new}'"
+    for old, new in corrected_targets.items():
+        yield f"Target '{old}' → '{new}' (verified via web search)"
+    if normalized_targets:
+        for target, normalized_target in zip(targets, normalized_targets):
+            if normalized_target != target and target not in corrected_targets:
+                yield f"Target normalized: {target} → {normalized_target}"
+
+
+def _coerce_answer(result: Dict[str, Any]) -> str:
+    """Get the displayable answer from a graph result.
+    
+    Args:
+        result: Graph result dict
+        
+    Returns:
+        'answer' or 'final_answer' as a string, or a placeholder if neither is set
+    """
+    # The fallback chain is always truthy, so str() is the only coercion needed
+    return str(result.get("answer") or result.get("final_answer") or _NO_ANSWER)
+
+
+def _extract_turn_meta(result: Dict[str, Any], normalized: Dict[str, Any]) -> Tuple[List[str], Optional[str]]:
+    """Pull the tools used and the verified target out of a graph result.
+    
+    Args:
+        result: Graph result dict
+        normalized: Input normalization result for the prompt
+        
+    Returns:
+        (tools_used, verified_target). The target is the clarified domain,
+        else the session target, else the first normalized target.
+    """
+    tools_used = [tr["tool_name"] for tr in (result.get("tool_results") or ()) if tr.get("tool_name")]
+    
+    state = result.get("state") or {}
+    verified_target = (
+        (state.get("target_clarification") or {}).get("verified_domain")
+        or (state.get("session_context") or {}).get("target_domain")
+        or next(iter(normalized.get("targets") or ()), None)
+    )
+    return tools_used, verified_target
+
+
+def _run_in_daemon_thread(loop: asyncio.AbstractEventLoop, func: Callable, *args, **kwargs) -> asyncio.Future:
+    """Run a blocking call on a daemon thread and expose it as a loop future.
+    
+    Unlike asyncio.to_thread, the worker is a daemon, so Ctrl+C is not held
+    up waiting for a long graph run to finish at loop shutdown.
+    
+    Args:
+        loop: Running event loop that owns the returned future
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+        
+    Returns:
+        Future resolved with func's result or exception
+    """
+    future = loop.create_future()
+    
+    def _settle(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def _worker():
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            settle_args = (future.set_exception, e)
+        else:
+            settle_args = (future.set_result, result)
+        try:
+            loop.call_soon_threadsafe(_settle, *settle_args)
+        except RuntimeError:
+            pass  # Loop already closed (interrupted turn)
+    
+    threading.Thread(target=_worker, daemon=True).start()
+    return future
+
+
+def _continue_after_approval(graph: PentestGraph, approval_state: Dict[str, Any], result: Dict[str, Any]):
+    """Resume the graph from an approved state, updating result from synthesis.
+    
+    Args:
+        graph: Pentest graph
+        approval_state: State returned by run_streaming, already marked approved
+        result: Turn result dict to update in place
+    """
+    for event in graph.graph.stream(approval_state):
+        for node_name, node_state in event.items():
+            if graph.stream_callback:
+                graph.stream_callback("state_update", node_name, node_state)
+            
+            # Update result with final state
+            if node_name == "synthesize":
+                result["answer"] = node_state.get("final_answer", result.get("answer", ""))
+                result["tool_results"] = node_state.get("tool_results", [])
+                result["search_results"] = node_state.get("search_results")
+                result["knowledge_results"] = node_state.get("knowledge_results")
+
+
+async def _probe_startup(refresh_models: bool = False) -> List[Any]:
+    """Run the independent blocking startup calls concurrently.
+    
+    Args:
+        refresh_models: Bypass the cached Ollama model list
+        
+    Returns:
+        [memory_manager, ollama_model_names, tool_calling_model_names]; any entry
+        may be the exception its call raised
+    """
+    return await asyncio.gather(
+        asyncio.to_thread(get_memory_manager),
+        asyncio.to_thread(get_model_names, refresh=refresh_models),
+        asyncio.to_thread(lambda: get_tool_calling_registry().list_models()),
+        return_exceptions=True
+    )
+
+
+class StreamCallbacks:
+    """Callbacks handed to the input normalizer and the pentest graph.
+    
+    Bound methods of one long-lived instance replace per-turn closures;
+    approval detection state lives on the instance instead of a nonlocal.
+    While run_graph is active, graph events are queued from the worker
+    thread and rendered by a drain task on the event loop, so model and
+    tool latency overlaps with painting.
+    """
+    
+    def __init__(self, streaming_manager: StreamingManager):
+        """Initialize callbacks.
+        
+        Args:
+            streaming_manager: Streaming manager that renders events
+        """
+        self.streaming_manager = streaming_manager
+        self.pending_approval_state: Optional[Dict[str, Any]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        # Stream/event name -> panel id, so repeated chunks skip panel lookup and parsing
+        self._model_panel_ids: Dict[str, str] = {}
+        self._tool_panel_ids: Dict[str, str] = {}
+    
+    def ask_user_question(self, question: str) -> str:
+        """Ask user a question and return their answer."""
+        return safe_prompt_ask(f"\n[bold yellow]❓ {question}[/bold yellow]")
+    
+    async def run_graph(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking graph call off the loop while draining its events.
+        
+        Args:
+            func: Blocking graph call (e.g. graph.run_streaming)
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            func's return value
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._loop, self._queue = loop, queue
+        drain_task = asyncio.create_task(self._drain(queue))
+        try:
+            return await _run_in_daemon_thread(loop, func, *args, **kwargs)
+        finally:
+            self._loop = self._queue = None
+            # Events posted before the worker finished are already queued ahead of this
+            queue.put_nowait(None)
+            await drain_task
+    
+    async def _drain(self, queue: asyncio.Queue):
+        """Render queued graph events until the end-of-run sentinel."""
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            self._render_event(*event)
+    
+    def on_event(self, event_type: str, event_name: str, event_data: Any):
+        """Handle streaming events from graph."""
+        loop, queue = self._loop, self._queue
+        if queue is not None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (event_type, event_name, event_data))
+                return
+            except RuntimeError:
+                pass  # Loop closed mid-run; render inline instead
+        self._render_event(event_type, event_name, event_data)
+    
+    def _render_event(self, event_type: str, event_name: str, event_data: Any):
+        """Apply a graph event to the streaming display."""
+        handler = self._EVENT_HANDLERS.get(event_type)
+        if handler is None:
+            return
         try:
-            if hasattr(sys.stdin, 'buffer'):
-                sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
-        except:
+            handler(self, event_name, event_data)
+        except Exception:
             pass
+    
+    def _model_panel(self, name: str, title: Optional[str] = None) -> str:
+        """Get (creating once) the model panel for a stream name."""
+        panel_id = self._model_panel_ids.get(name)
+        if panel_id is None or panel_id not in self.streaming_manager.model_panels:
+            panel_id = self.streaming_manager.create_model_panel(name, title=title)
+            self._model_panel_ids[name] = panel_id
+        return panel_id
+    
+    def _on_final_answer(self, event_name: str, event_data: Any):
+        # Synthesis output renders straight into the Final Answer panel
+        if isinstance(event_data, str):
+            self.streaming_manager.stream_model_response(
+                self._model_panel("final_answer", title="Final Answer"), event_data
+            )
+    
+    def _on_model_response(self, event_name: str, event_data: Any):
+        # Model response streaming
+        if isinstance(event_data, str):
+            self.streaming_manager.stream_model_response(self._model_panel(event_name), event_data)
+    
+    def _on_tool_output(self, event_name: str, event_data: Any):
+        # Tool output streaming; the panel is resolved once per event_name
+        # (format: "tool_name" or "tool_name:command_name")
+        streaming_manager = self.streaming_manager
+        panel_id = self._tool_panel_ids.get(event_name)
+        if panel_id is None or panel_id not in streaming_manager.tool_panels:
+            tool_name, _, command_name = event_name.partition(":")
+            panel_id = streaming_manager.create_tool_panel(
+                tool_name=sys.intern(tool_name),
+                command_name=command_name or None
+            )
+            self._tool_panel_ids[event_name] = panel_id
+        if isinstance(event_data, str):
+            streaming_manager.update_tool_output(panel_id, event_data)
+    
+    def _on_state_update(self, event_name: str, event_data: Any):
+        self.streaming_manager.update_progress(f"Node: {event_name}")
+    
+    _EVENT_HANDLERS: Dict[str, Callable[["StreamCallbacks", str, Any], None]] = {
+        "final_answer": _on_final_answer,
+        "model_response": _on_model_response,
+        "tool_output": _on_tool_output,
+        "state_update": _on_state_update,
+    }
+    
+    def approval_aware(self, event_type: str, event_name: str, event_data: Any):
+        """Handle a graph event and remember state that needs tool approval."""
+        self.on_event(event_type, event_name, event_data)
         
-        # Use standard input as fallback with clean prompt
+        # Check if this is a recommend_tools node that needs approval
+        if event_type == "state_update" and event_name == "recommend_tools" and isinstance(event_data, dict):
+            recommendations = event_data.get("tool_recommendations")
+            if recommendations and recommendations.get("needs_approval") and event_data.get("user_approval") is None:
+                self.pending_approval_state = event_data
+
+
+class ReplContext:
+    """Mutable REPL state shared with the slash-command handlers."""
+
+    def __init__(self, conversation_api: ConversationAPI, memory_manager,
+                 conversation_id: Optional[str], session_id: Optional[str]):
+        """Initialize REPL context.
+
+        Args:
+            conversation_api: ConversationAPI instance
+            memory_manager: MemoryManager instance
+            conversation_id: Active conversation UUID
+            session_id: Active legacy session ID
+        """
+        self.conversation_api = conversation_api
+        self.memory_manager = memory_manager
+        self.conversation_id = conversation_id
+        self.session_id = session_id
+
+
+def _cmd_list(repl: ReplContext, cmd_parts: List[str]):
+    """List conversations."""
+    result = repl.conversation_api.list_conversations(limit=20, fields=_LISTING_FIELDS)
+    if result.get("success"):
+        conversations = result["conversations"]
+        console.print("\n[bold]Conversations:[/bold]")
+        for conv in conversations:
+            title = conv.get("title") or "Untitled"
+            conv_id = conv.get("id")
+            updated = conv.get("updated_at", "")[:19] if conv.get("updated_at") else ""
+            console.print(f"  • {title} - {conv_id[:8]}... - {updated}")
+
+
+def _cmd_switch(repl: ReplContext, cmd_parts: List[str]):
+    """Switch to another conversation."""
+    if len(cmd_parts) < 2:
+        console.print("[dim]Usage: /switch <id>[/dim]")
+        return
+    conv_id = cmd_parts[1]
+    switch_result = repl.conversation_api.switch_conversation(conv_id, repl.memory_manager)
+    if switch_result.get("success"):
+        repl.conversation_id = conv_id
+        repl.session_id = repl.memory_manager.session_id
+        console.print(f"[green]✅ Switched to conversation: {conv_id}[/green]")
+    else:
+        console.print(f"[red]❌ Failed to switch: {switch_result.get('error')}[/red]")
+
+
+def _cmd_new(repl: ReplContext, cmd_parts: List[str]):
+    """Create a new conversation."""
+    repl.conversation_id = repl.memory_manager.start_conversation()
+    repl.session_id = repl.memory_manager.session_id
+    console.print(f"[green]✅ Created new conversation: {repl.conversation_id}[/green]")
+
+
+def _cmd_save(repl: ReplContext, cmd_parts: List[str]):
+    """Save current conversation state."""
+    if repl.conversation_id:
+        # Completed turns are already persisted; flush anything left in the journal
         try:
-            if default:
-                result = input(f"{plain_prompt} (default: {default}): ").strip()
-                return result if result else default
-            else:
-                return input(f"{plain_prompt}: ").strip()
-        except KeyboardInterrupt:
-            raise
-    except Exception as e:
-        # Last resort fallback - use standard input with clean prompt
+            replayed = repl.memory_manager.compact_journal(repl.conversation_id)
+        except Exception as e:
+            console.print(f"[red]❌ Failed to save conversation: {e}[/red]")
+            return
+        if replayed:
+            console.print(f"[dim]Recovered {replayed} unsaved message(s) from journal[/dim]")
+        console.print(f"[green]✅ Conversation state saved[/green]")
+
+
+def _cmd_autonomy(repl: ReplContext, cmd_parts: List[str]):
+    """View or set the autonomy level."""
+    controller = get_autonomy_controller()
+
+    if len(cmd_parts) > 1:
         try:
-            if default:
-                result = input(f"{plain_prompt} (default: {default}): ").strip()
-                return result if result else default
+            new_level = int(cmd_parts[1])
+            if 0 <= new_level <= 3:
+                controller.set_level(AutonomyLevel(new_level), repl.conversation_id)
+                console.print(f"[green]✅ Autonomy level set to: {LEVEL_DESCRIPTIONS[AutonomyLevel(new_level)]}[/green]")
             else:
-                return input(f"{plain_prompt}: ").strip()
-        except KeyboardInterrupt:
-            raise
-        except Exception:
-            # Ultimate fallback - return default or empty
-            return default if default else ""
+                console.print("[red]Invalid level. Use 0-3.[/red]")
+        except ValueError:
+            console.print("[red]Invalid level. Use a number 0-3.[/red]")
+    else:
+        current = controller.get_level(repl.conversation_id)
+        console.print(f"\n[bold]Current Autonomy Level: {LEVEL_DESCRIPTIONS[current]}[/bold]")
+        console.print("\nAvailable levels:")
+        for lvl in AutonomyLevel:
+            marker = " ← current" if lvl == current else ""
+            console.print(f"  {lvl.value} = {LEVEL_DESCRIPTIONS[lvl]}{marker}")
+        console.print("\n[dim]Usage: /autonomy <level>[/dim]")
 
 
-def main():
-    """Main entry point."""
-    console.print(Panel.fit(
-        "[bold cyan]AI Pentest Agent Multi-Model[/bold cyan]\n"
-        "Ollama, AutoGen, LangGraph, LlamaIndex, RAG\n"
-        "[dim]With Live Streaming & Typo Handling[/dim]",
-        border_style="cyan"
-    ))
+def _cmd_help(repl: ReplContext, cmd_parts: List[str]):
+    """Show available commands."""
+    console.print("\n[bold]Commands:[/bold]")
+    console.print("  /list - List all conversations")
+    console.print("  /switch <id> - Switch to conversation")
+    console.print("  /new - Create new conversation")
+    console.print("  /save - Save current conversation")
+    console.print("  /autonomy [level] - View or set autonomy level (0-3)")
+    console.print("  /help - Show this help")
+
+
+_COMMANDS: Dict[str, Callable[[ReplContext, List[str]], None]] = {
+    "list": _cmd_list,
+    "switch": _cmd_switch,
+    "new": _cmd_new,
+    "save": _cmd_save,
+    "autonomy": _cmd_autonomy,
+    "help": _cmd_help,
+}
+
+
+def main(refresh_models: bool = False):
+    """Main entry point.
+    
+    Args:
+        refresh_models: Query Ollama for installed models instead of using the cached list
+    """
+    console.print(_WELCOME_PANEL)
     
     # Initialize components
-    # Enable keyboard listener for expand/collapse (only if stdin is a terminal)
-    enable_keyboard = sys.stdin.isatty() if hasattr(sys.stdin, 'isatty') else True
+    # Enable keyboard listener for expand/collapse (only if stdin is a terminal and not under CI)
+    enable_keyboard = (sys.stdin.isatty() if hasattr(sys.stdin, 'isatty') else True) and not os.environ.get("CI")
     streaming_manager = StreamingManager(console=console, enable_keyboard=enable_keyboard)
     search_aggregator = SearchAggregator()
     
-    # Create interactive callback for asking user questions
-    def ask_user_question(question: str) -> str:
-        """Ask user a question and return their answer."""
-        return safe_prompt_ask(f"\n[bold yellow]❓ {question}[/bold yellow]")
+    callbacks = StreamCallbacks(streaming_manager)
     
-    # Initialize Mistral for semantic understanding in input normalizer (replacing Qwen3)
-    from models.generic_ollama_agent import GenericOllamaAgent
+    # Initialize Mistral for semantic understanding in input normalizer (replacing Qwen3).
+    # GenericOllamaAgent builds its client and templates lazily, so this is cheap.
     mistral_agent = GenericOllamaAgent(
         model_name="mistral:latest",
         prompt_template="qwen3_system.jinja2"
     )
     
-    input_normalizer = InputNormalizer(
+    # Repeated prompts reuse their normalization instead of re-running LLM + web checks
+    input_normalizer = NormalizeCache(InputNormalizer(
         search_aggregator=search_aggregator,
-        interactive_callback=ask_user_question,
+        interactive_callback=callbacks.ask_user_question,
         ai_model=mistral_agent  # Enable AI-based semantic understanding
-    )
-    conversation_retriever = ConversationRetriever()
-    results_storage = ToolResultsStorage()
+    ))
     
-    # Initialize memory manager and conversation API
-    from memory.manager import get_memory_manager
-    memory_manager = get_memory_manager()
+    # Independent startup I/O (DB/Redis connections, Ollama model list, tool model registry)
+    # runs concurrently; failures are handled by the sections below as before
+    memory_manager, available_models, available_tool_models = asyncio.run(_probe_startup(refresh_models))
+    if isinstance(memory_manager, BaseException):
+        raise memory_manager
     conversation_api = ConversationAPI(memory_manager=memory_manager)
     
-    # Create streaming callback for graph
-    def graph_stream_callback(event_type: str, event_name: str, event_data: any):
-        """Handle streaming events from graph."""
-        try:
-            if event_type == "model_response":
-                # Model response streaming
-                panel_id = streaming_manager.create_model_panel(event_name)
-                if isinstance(event_data, str):
-                    streaming_manager.stream_model_response(panel_id, event_data)
-            elif event_type == "tool_output":
-                # Tool output streaming
-                # event_name format: "tool_name" or "tool_name:command_name"
-                parts = event_name.split(":", 1)
-                tool_name = parts[0]
-                command_name = parts[1] if len(parts) > 1 else None
-                
-                panel_id = streaming_manager.create_tool_panel(
-                    tool_name=tool_name,
-                    command_name=command_name
-                )
-                if isinstance(event_data, str):
-                    streaming_manager.update_tool_output(panel_id, event_data)
-            elif event_type == "state_update":
-                # State update
-                streaming_manager.update_progress(f"Node: {event_name}")
-                pass
-        except Exception as e:
-
-            pass
-    
     # Multi-Agent Model Selection - Auto-detect available Ollama models
     agent_model_config = {} 
     selected_model = "mistral:latest"  
     
     try:
-        from utils.ollama_helper import get_model_names, check_model_exists
-        from utils.model_selector import MultiAgentModelSelector
-        
         console.print("\n[bold cyan]Model Selection[/bold cyan]")
         
-        # Get available models from Ollama
-        available_models = get_model_names()
+        # Available models from Ollama were fetched by _probe_startup
+        if isinstance(available_models, BaseException):
+            raise available_models
         
         if not available_models:
             console.print("[yellow]⚠️  No models found in Ollama. Please install at least one model.[/yellow]")
@@ -180,10 +594,13 @@ def main():
         else:
             # Ask user for model selection mode
             console.print(f"[dim]Found {len(available_models)} model(s) in Ollama.[/dim]\n")
-            console.print("1. Quick mode: Use same model for all agents")
-            console.print("2. Multi-agent mode: Assign different models to different agents")
-            
-            mode_choice = safe_prompt_ask("\n[dim]Select mode (1-2, default: 2)[/dim]", default="2")
+            if MultiAgentModelSelector is None:
+                mode_choice = "1"
+            else:
+                console.print("1. Quick mode: Use same model for all agents")
+                console.print("2. Multi-agent mode: Assign different models to different agents")
+                
+                mode_choice = safe_prompt_ask("\n[dim]Select mode (1-2, default: 2)[/dim]", default="2")
             
             if mode_choice == "1":
                 # Quick mode: Single model for all agents
@@ -240,9 +657,9 @@ def main():
     tool_calling_model_name = "json_tool_calling"
     
     try:
-        from models.tool_calling_registry import get_tool_calling_registry
+        if isinstance(available_tool_models, BaseException):
+            raise available_tool_models
         tool_registry = get_tool_calling_registry()
-        available_tool_models = tool_registry.list_models()
         
         console.print("\n[bold cyan]Tool Calling Model Selection[/bold cyan]")
         for i, model_name in enumerate(available_tool_models, 1):
@@ -268,7 +685,6 @@ def main():
         tool_calling_model_name = "json_tool_calling"
     
     # Autonomy Level Selection
-    from agents.autonomy_controller import get_autonomy_controller, AutonomyLevel, LEVEL_DESCRIPTIONS
     autonomy_controller = get_autonomy_controller()
     
     try:
@@ -304,7 +720,7 @@ def main():
         autonomy_controller.set_level(AutonomyLevel.COPILOT)
     
     graph = PentestGraph(
-        stream_callback=graph_stream_callback,
+        stream_callback=callbacks.on_event,
         analysis_model=selected_model,
         tool_calling_model=tool_calling_model_name,
         agent_model_config=agent_model_config
@@ -327,6 +743,7 @@ def main():
         console.print("\n\n[yellow]Interrupted by user. Goodbye![/yellow]")
         sys.exit(0)
     
+    # Each branch sets current_conversation_id only on success; a single fallback below covers the rest
     if choice == "1":
         try:
             title = safe_prompt_ask("[dim]Conversation title (optional)[/dim]", default="")
@@ -339,9 +756,8 @@ def main():
             console.print(f"[green]✅ Created conversation: {current_conversation_id}[/green]")
         else:
             console.print(f"[red]❌ Failed to create conversation: {result.get('error')}[/red]")
-            current_conversation_id = memory_manager.start_conversation()
     elif choice == "2":
-        result = conversation_api.list_conversations(limit=10)
+        result = conversation_api.list_conversations(limit=10, fields=_LISTING_FIELDS)
         if result.get("success"):
             conversations = result["conversations"]
             if conversations:
@@ -360,23 +776,16 @@ def main():
                 if load_choice.isdigit():
                     idx = int(load_choice) - 1
                     if 0 <= idx < len(conversations):
-                        current_conversation_id = conversations[idx]["id"]
-                        switch_result = conversation_api.switch_conversation(current_conversation_id, memory_manager)
+                        switch_result = conversation_api.switch_conversation(conversations[idx]["id"], memory_manager)
                         if switch_result.get("success"):
+                            current_conversation_id = conversations[idx]["id"]
                             console.print(f"[green]✅ Loaded conversation: {conversations[idx].get('title', 'Untitled')}[/green]")
                         else:
                             console.print(f"[red]❌ Failed to load conversation[/red]")
-                            current_conversation_id = memory_manager.start_conversation()
-                    else:
-                        current_conversation_id = memory_manager.start_conversation()
-                else:
-                    current_conversation_id = memory_manager.start_conversation()
             else:
                 console.print("[yellow]No existing conversations. Creating new...[/yellow]")
-                current_conversation_id = memory_manager.start_conversation()
         else:
             console.print(f"[red]❌ Failed to list conversations[/red]")
-            current_conversation_id = memory_manager.start_conversation()
     elif choice == "3":
         try:
             conv_id = safe_prompt_ask("[dim]Conversation ID[/dim]")
@@ -390,11 +799,9 @@ def main():
                 console.print(f"[green]✅ Loaded conversation: {conv_id}[/green]")
             else:
                 console.print(f"[red]❌ Failed to load conversation: {switch_result.get('error')}[/red]")
-                current_conversation_id = memory_manager.start_conversation()
-        else:
-            current_conversation_id = memory_manager.start_conversation()
-    else:
-        # Default: Create new conversation
+    
+    # Default (choice 4) and every failed branch above: start a new conversation
+    if current_conversation_id is None:
         current_conversation_id = memory_manager.start_conversation()
     
     # Get session_id for legacy compatibility
@@ -405,114 +812,51 @@ def main():
         console.print(f"[dim]Session ID (legacy): {session_id}[/dim]")
     console.print("")
     
+    repl = ReplContext(conversation_api, memory_manager, current_conversation_id, session_id)
+    # A down memory backend fails every turn; warn once, then only log at debug level
+    memory_save_warned = False
+    
     try:
         while True:
             # Get user input
             user_prompt = safe_prompt_ask("\n[bold green]You[/bold green]")
             
-            if user_prompt.lower() in ["exit", "quit", "q"]:
+            lp = user_prompt.lower()
+            if lp in _EXIT_WORDS:
                 console.print("\n[cyan]Goodbye![/cyan]")
                 break
             
-            # Normalize input (fix typos, extract targets, verify DNS with web search)
-            normalized = input_normalizer.normalize_input(user_prompt, verify_domains=True)
-            normalized_prompt = normalized.get("normalized_text", user_prompt)
-            
-            # Show normalization if there were corrections
-            corrections = []
-            if normalized.get("corrected_tools"):
-                for old, new in normalized["corrected_tools"].items():
-                    corrections.append(f"Tool '{old}' → '{new}'")
-            if normalized.get("corrected_targets"):
-                for old, new in normalized["corrected_targets"].items():
-                    corrections.append(f"Target '{old}' → '{new}' (verified via web search)")
-            if normalized.get("normalized_targets"):
-                for i, target in enumerate(normalized.get("targets", [])):
-                    normalized_target = normalized["normalized_targets"][i]
-                    if normalized_target != target and target not in normalized.get("corrected_targets", {}):
-                        corrections.append(f"Target normalized: {target} → {normalized_target}")
-            
-            if corrections:
-                console.print(f"[dim]Corrections: {', '.join(corrections)}[/dim]")
-            
-            # Check for special commands
-            if user_prompt.lower().startswith("/"):
+            # Check for special commands (before normalization, which they never need).
+            # Arguments keep their original case; only the verb is matched lowercased.
+            if lp[:1] == "/":
                 cmd_parts = user_prompt[1:].split()
-                cmd = cmd_parts[0].lower() if cmd_parts else ""
+                cmd = lp[1:].split(None, 1)[0] if cmd_parts else ""
                 
-                if cmd == "list":
-                    # List conversations
-                    result = conversation_api.list_conversations(limit=20)
-                    if result.get("success"):
-                        conversations = result["conversations"]
-                        console.print("\n[bold]Conversations:[/bold]")
-                        for conv in conversations:
-                            title = conv.get("title") or "Untitled"
-                            conv_id = conv.get("id")
-                            updated = conv.get("updated_at", "")[:19] if conv.get("updated_at") else ""
-                            console.print(f"  • {title} - {conv_id[:8]}... - {updated}")
-                    continue
-                elif cmd == "switch" and len(cmd_parts) > 1:
-                    # Switch conversation
-                    conv_id = cmd_parts[1]
-                    switch_result = conversation_api.switch_conversation(conv_id, memory_manager)
-                    if switch_result.get("success"):
-                        current_conversation_id = conv_id
-                        session_id = memory_manager.session_id
-                        console.print(f"[green]✅ Switched to conversation: {conv_id}[/green]")
-                    else:
-                        console.print(f"[red]❌ Failed to switch: {switch_result.get('error')}[/red]")
-                    continue
-                elif cmd == "new":
-                    # Create new conversation
-                    current_conversation_id = memory_manager.start_conversation()
-                    session_id = memory_manager.session_id
-                    console.print(f"[green]✅ Created new conversation: {current_conversation_id}[/green]")
-                    continue
-                elif cmd == "save":
-                    # Save current conversation state
-                    if current_conversation_id:
-                        # State is already persisted, just confirm
-                        console.print(f"[green]✅ Conversation state saved[/green]")
-                    continue
-                elif cmd == "autonomy":
-                    # Autonomy level control
-                    from agents.autonomy_controller import get_autonomy_controller, AutonomyLevel, LEVEL_DESCRIPTIONS
-                    controller = get_autonomy_controller()
-                    
-                    if len(cmd_parts) > 1:
-                        try:
-                            new_level = int(cmd_parts[1])
-                            if 0 <= new_level <= 3:
-                                controller.set_level(AutonomyLevel(new_level), current_conversation_id)
-                                console.print(f"[green]✅ Autonomy level set to: {LEVEL_DESCRIPTIONS[AutonomyLevel(new_level)]}[/green]")
-                            else:
-                                console.print("[red]Invalid level. Use 0-3.[/red]")
-                        except ValueError:
-                            console.print("[red]Invalid level. Use a number 0-3.[/red]")
-                    else:
-                        current = controller.get_level(current_conversation_id)
-                        console.print(f"\n[bold]Current Autonomy Level: {LEVEL_DESCRIPTIONS[current]}[/bold]")
-                        console.print("\nAvailable levels:")
-                        for lvl in AutonomyLevel:
-                            marker = " ← current" if lvl == current else ""
-                            console.print(f"  {lvl.value} = {LEVEL_DESCRIPTIONS[lvl]}{marker}")
-                        console.print("\n[dim]Usage: /autonomy <level>[/dim]")
-                    continue
-                elif cmd == "help":
-                    console.print("\n[bold]Commands:[/bold]")
-                    console.print("  /list - List all conversations")
-                    console.print("  /switch <id> - Switch to conversation")
-                    console.print("  /new - Create new conversation")
-                    console.print("  /save - Save current conversation")
-                    console.print("  /autonomy [level] - View or set autonomy level (0-3)")
-                    console.print("  /help - Show this help")
+                handler = _COMMANDS.get(cmd)
+                if handler:
+                    handler(repl, cmd_parts)
+                    current_conversation_id = repl.conversation_id
+                    session_id = repl.session_id
                     continue
             
-            # Add to persistent conversation buffer (production)
+            # Normalize input (fix typos, extract targets, verify DNS with web search).
+            # Prompts without anything target-shaped skip the normalizer and its lookups.
+            if _HAS_TARGET_RE.search(user_prompt):
+                verify = bool(_DOMAIN_HINT_RE.search(user_prompt))
+                normalized = input_normalizer.normalize_input(user_prompt, verify_domains=verify)
+            else:
+                normalized = {"normalized_text": user_prompt}
+            
+            # Show normalization if there were corrections
+            corrections = ", ".join(_iter_corrections(normalized))
+
+            if corrections:
+                console.print(f"[dim]Corrections: {corrections}[/dim]")
+            
+            # Journal the prompt (production); persist_turn writes it to PostgreSQL with the answer
             if current_conversation_id:
                 try:
-                    memory_manager.conversation_store.add_message(current_conversation_id, "user", user_prompt)
+                    memory_manager.journal_message(current_conversation_id, "user", user_prompt)
                 except Exception:
                     # Fallback to legacy
                     memory_manager.add_to_conversation_buffer(session_id, "user", user_prompt, conversation_id=current_conversation_id)
@@ -529,35 +873,19 @@ def main():
             try:
                 # Run graph with conversation_id (with Human in the Loop support)
                 # We'll handle approval in the callback
-                pending_approval_state = None
-                
-                # Modified callback to handle approval
-                def approval_aware_callback(event_type: str, event_name: str, event_data: any):
-                    nonlocal pending_approval_state
-                    
-                    # Call original callback
-                    graph_stream_callback(event_type, event_name, event_data)
-                    
-                    # Check if this is a recommend_tools node that needs approval
-                    if event_type == "state_update" and event_name == "recommend_tools":
-                        if isinstance(event_data, dict):
-                            recommendations = event_data.get("tool_recommendations")
-                            approval = event_data.get("user_approval")
-                            
-                            if recommendations and recommendations.get("needs_approval") and approval is None:
-                                # Store state for approval
-                                pending_approval_state = event_data
+                callbacks.pending_approval_state = None
                 
                 # Set up approval-aware callback temporarily
                 original_callback = graph.stream_callback
-                graph.stream_callback = approval_aware_callback
+                graph.stream_callback = callbacks.approval_aware
                 
-                # Run graph
-                result = graph.run_streaming(
+                # Run graph on a worker thread; events render as they arrive
+                result = asyncio.run(callbacks.run_graph(
+                    graph.run_streaming,
                     user_prompt, 
                     session_id=session_id,  # Legacy support
                     conversation_id=current_conversation_id  # Production
-                )
+                ))
                 
                 # Restore original callback
                 graph.stream_callback = original_callback
@@ -584,7 +912,7 @@ def main():
                         console.print("\n\n[yellow]Interrupted by user. Goodbye![/yellow]")
                         sys.exit(0)
                     
-                    if approval_response.lower() in ["yes", "y", "approve", "ok", "okay"]:
+                    if approval_response.lower() in _APPROVAL_WORDS:
                         # User approved, update state and continue execution
                         approval_state["user_approval"] = "yes"
                         approval_state.pop("_needs_approval", None)  # Remove flag
@@ -592,18 +920,7 @@ def main():
                         streaming_manager.log_message("✅ Executing tools...", style="green")
                         
                         # Continue graph execution from approval state
-                        # Stream from the updated state
-                        for event in graph.graph.stream(approval_state):
-                            for node_name, node_state in event.items():
-                                if graph.stream_callback:
-                                    graph.stream_callback("state_update", node_name, node_state)
-                                
-                                # Update result with final state
-                                if node_name == "synthesize":
-                                    result["answer"] = node_state.get("final_answer", result.get("answer", ""))
-                                    result["tool_results"] = node_state.get("tool_results", [])
-                                    result["search_results"] = node_state.get("search_results")
-                                    result["knowledge_results"] = node_state.get("knowledge_results")
+                        asyncio.run(callbacks.run_graph(_continue_after_approval, graph, approval_state, result))
                     else:
                         # User rejected, skip tools and go to synthesis
                         streaming_manager.log_message("⏭️ Skipping tools. Proceeding to synthesis...", style="yellow")
@@ -612,59 +929,19 @@ def main():
                         approval_state["user_approval"] = "no"
                         approval_state.pop("_needs_approval", None)
                         
-                        # Continue to synthesize directly
-                        from agents.pentest_graph import GraphState
-                        synthesize_state = approval_state.copy()
-                        synthesize_result = graph._synthesize_node(synthesize_state)
+                        # Continue to synthesize directly. approval_state is not reused after
+                        # this, so the node may mutate it in place (it sets final_answer)
+                        synthesize_result = asyncio.run(callbacks.run_graph(graph._synthesize_node, approval_state))
                         
                         result["answer"] = synthesize_result.get("final_answer", "Tools were skipped as requested.")
                         result["tool_results"] = []
                 
-                # Get answer with robust None handling
-                answer = result.get("answer") or result.get("final_answer") or "No answer generated."
-                # Ensure answer is always a string, never None
-                if answer is None:
-                    answer = "No answer was generated. Please try again."
-                if not isinstance(answer, str):
-                    answer = str(answer)
-                
-                # Add to persistent conversation buffer (production)
-                if current_conversation_id:
-                    try:
-                        memory_manager.conversation_store.add_message(current_conversation_id, "assistant", answer)
-                        # Auto-compress if needed
-                        memory_manager.summary_compressor.auto_compress_if_needed(current_conversation_id)
-                    except Exception:
-                        # Fallback to legacy
-                        memory_manager.add_to_conversation_buffer(session_id, "assistant", answer, conversation_id=current_conversation_id)
-                else:
-                    # Legacy fallback
-                    memory_manager.add_to_conversation_buffer(session_id, "assistant", answer)
+                answer = _coerce_answer(result)
                 
-                # Save conversation turn to memory manager (includes RAG, buffer, verified targets)
+                # Persist the turn in one call (PostgreSQL, RAG, buffer, verified targets)
                 try:
-                    # Extract tools used from result
-                    tools_used = []
-                    tool_results = result.get("tool_results", [])
-                    if tool_results:
-                        tools_used = [tr.get("tool_name", "") for tr in tool_results if tr.get("tool_name")]
-                    
-                    # Extract verified target from result state if available
-                    verified_target = None
-                    result_state = result.get("state", {})
-                    if result_state:
-                        target_clarification = result_state.get("target_clarification", {})
-                        verified_target = target_clarification.get("verified_domain")
-                        if not verified_target:
-                            session_context = result_state.get("session_context", {})
-                            verified_target = session_context.get("target_domain")
-                    
-                    if not verified_target:
-                        extracted_targets = normalized.get("targets", [])
-                        if extracted_targets:
-                            verified_target = extracted_targets[0]
-                    
-                    memory_manager.save_turn(
+                    tools_used, verified_target = _extract_turn_meta(result, normalized)
+                    memory_manager.persist_turn(
                         user_message=user_prompt,
                         assistant_message=answer,
                         tools_used=tools_used,
@@ -673,21 +950,29 @@ def main():
                         context={"target_domain": verified_target}
                     )
                 except Exception as e:
-                    import warnings
-                    warnings.warn(f"Failed to save to memory: {str(e)}")
+                    if memory_save_warned:
+                        logger.debug("Failed to save to memory: %s", e)
+                    else:
+                        logger.warning("Failed to save to memory: %s (further failures are logged at debug level)", e)
+                        memory_save_warned = True
                 
                 streaming_manager.complete_progress_step("Workflow completed")
+                # The streamed text is the answer only if synthesis finished: a stream that
+                # failed part-way leaves a truncated panel and an "Error: ..." answer
+                streamed = streaming_manager.get_model_output("final_answer")
+                answer_streamed = bool(streamed) and streamed.strip() == answer.strip()
+                if answer_streamed:
+                    streaming_manager.complete_model_panel("final_answer")
+                elif streamed:
+                    streaming_manager.update_model_status("final_answer", "✗ Incomplete")
                 
                 streaming_manager.stop()
                 
                 console.print()  
-                if not answer or not isinstance(answer, str):
-                    answer = "No answer was generated. Please try again."
-                console.print(Panel(
-                    answer,
-                    title="[bold blue]Final Answer[/bold blue]",
-                    border_style="blue"
-                ))
+                # Streamed answers are already on screen in the live display;
+                # anything else (no synthesis, failed stream) gets the final panel
+                if not answer_streamed:
+                    console.print(Panel(answer, **_FINAL_PANEL_KW))
                 
                 # Show tool results if any
                 tool_results = result.get("tool_results", [])
@@ -701,6 +986,8 @@ def main():
     except KeyboardInterrupt:
         streaming_manager.stop()
         console.print("\n\n[yellow]Interrupted by user. Goodbye![/yellow]")
+        # Don't lose turns still queued for the background writer
+        memory_manager.flush_writes()
         sys.exit(0)
     except Exception as e:
         streaming_manager.stop()
@@ -709,13 +996,17 @@ def main():
             sys.exit(0)
         else:
             console.print(f"\n[red]Error: {str(e)}[/red]")
-            import traceback
             console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI Pentest Agent")
+    parser.add_argument("--refresh-models", action="store_true",
+                        help="Ignore the cached Ollama model list and query Ollama")
+    args = parser.parse_args()
+    
     try:
-        main()
+        main(refresh_models=args.refresh_models)
     except KeyboardInterrupt:
         console = Console()
         console.print("\n\n[yellow]Interrupted by user. Goodbye![/yellow]")
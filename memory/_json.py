@@ -0,0 +1,28 @@
+"""JSON helpers for the memory package.
+
+Uses orjson when it is installed and falls back to the standard library, so
+callers get the fast path without depending on it.
+"""
+
+import json
+from typing import Any
+
+# Optional: much faster JSON encoding/decoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize a JSON str/bytes document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,112 @@
+"""Background writer for conversation messages.
+
+Moves PostgreSQL message inserts off the interactive path. Messages are queued
+and a daemon thread writes them in batches, one transaction per batch, via
+ConversationStore.add_messages_bulk. Callers that need to know a message is
+durable register a when_written callback, which runs on the worker thread only
+if the write succeeded. Pending messages are flushed at interpreter exit.
+"""
+
+import atexit
+import queue
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+
+class AsyncWriter:
+    """Batched, out-of-line message writer."""
+
+    def __init__(self,
+                 conversation_store,
+                 batch_size: int = 32,
+                 flush_interval: float = 0.05):
+        """Initialize async writer and start its worker thread.
+
+        Args:
+            conversation_store: ConversationStore used for bulk inserts
+            batch_size: Maximum number of messages written per transaction
+            flush_interval: Seconds to wait for more messages before writing a partial batch
+        """
+        self.conversation_store = conversation_store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # (conversation_id, role, content, metadata) messages and (conversation_id, callback) markers
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        # Conversations with a failed write since their last when_written marker
+        self._failed: Set[str] = set()
+        self._thread = threading.Thread(target=self._run, name="conversation-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def put(self, conversation_id: str, role: str, content: str, metadata: Optional[Dict] = None):
+        """Queue a message for writing.
+
+        Args:
+            conversation_id: Conversation UUID
+            role: Message role ('user', 'assistant', 'system')
+            content: Message content
+            metadata: Optional metadata dict
+        """
+        self._queue.put((conversation_id, role, content, metadata))
+
+    def when_written(self, conversation_id: str, callback: Callable[[], None]):
+        """Run callback once every message queued so far for a conversation is written.
+
+        The callback runs on the worker thread and is skipped if any of those
+        writes failed.
+
+        Args:
+            conversation_id: Conversation UUID
+            callback: Function to call after a successful write
+        """
+        self._queue.put((conversation_id, callback))
+
+    def flush(self):
+        """Block until every queued message has been written (or failed)."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def _run(self):
+        """Worker loop: drain up to batch_size messages and write them together."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    break
+
+            try:
+                # Markers split the batch so each sees exactly the writes queued before it
+                messages = []
+                for item in batch:
+                    if len(item) == 4:
+                        messages.append(item)
+                        continue
+                    self._write(messages)
+                    messages = []
+                    self._run_callback(*item)
+                self._write(messages)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, messages):
+        """Write messages in one transaction, remembering their conversations on failure."""
+        if not messages:
+            return
+        try:
+            self.conversation_store.add_messages_bulk(messages)
+        except Exception as e:
+            self._failed.update(message[0] for message in messages)
+            print(f"Error writing {len(messages)} message(s) to Postgres: {e}")
+
+    def _run_callback(self, conversation_id: str, callback: Callable[[], None]):
+        """Run a when_written callback unless a write for its conversation failed."""
+        if conversation_id in self._failed:
+            self._failed.discard(conversation_id)
+            return
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error in write callback: {e}")
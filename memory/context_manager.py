@@ -6,22 +6,59 @@ state at each turn and storing them in pgvector for semantic recall.
 Key concepts:
 - Snapshot: A frozen state of the session at a specific turn.
 - turn_id: Monotonically increasing ID for each interaction.
-- pgvector: Stores the embedding of each snapshot.
+- pgvector: Stores the embedding of each snapshot. Snapshots are queued and a
+  daemon thread writes them in batches (one embedding request + one INSERT per
+  batch), so the turn never waits on the embedding model or the database.
 """
 
 from dataclasses import dataclass, field, asdict
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import atexit
 import json
+import queue
+import threading
 import uuid
 import hashlib
 
+# Optional: much faster non-cryptographic hashing for snapshot fingerprints
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Optional: faster JSON encoding (returns bytes)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, via orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, sort_keys=sort_keys).encode()
+
+# Upper bound on the embedding text per snapshot, independent of tool output size
+MAX_TEXT_LENGTH = 8192
+# Part of the budget kept for the model response however much tool output there is
+RESPONSE_RESERVE = 500
+
 # Lazy imports to avoid circular deps
 # from memory.manager import MemoryManager 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SessionSnapshot:
-    """Immutable snapshot of a conversation turn."""
+    """Immutable snapshot of a conversation turn.
+    
+    The hash and text representation are derived lazily on first access and
+    cached, since the snapshot cannot change afterwards.
+    """
     id: str
     session_id: str
     turn_id: int
@@ -31,41 +68,69 @@ class SessionSnapshot:
     model_response: str
     reasoning_summary: str = ""
     confidence: float = 0.0
-    snapshot_hash: str = field(init=False)
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    _hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
-        """Compute hash after initialization."""
-        self.snapshot_hash = self._compute_hash()
+    @property
+    def snapshot_hash(self) -> str:
+        """Content fingerprint, computed on first access."""
+        if self._hash is None:
+            object.__setattr__(self, "_hash", self._compute_hash())
+        return self._hash
         
     def _compute_hash(self) -> str:
-        """Compute SHA256 hash to ensure immutability."""
+        """Compute a content fingerprint to ensure immutability.
+        
+        The hash only detects changes/duplicates; nothing relies on it being
+        cryptographic, so xxh3 is used when available (SHA-256 otherwise).
+        """
         try:
             # Sort keys for consistent hashing
-            content = f"{self.session_id}:{self.turn_id}:{json.dumps(self.user_intent, sort_keys=True)}:{self.model_response}"
-            return hashlib.sha256(content.encode()).hexdigest()
+            content = b":".join((
+                self.session_id.encode(),
+                str(self.turn_id).encode(),
+                _dumps(self.user_intent, sort_keys=True),
+                self.model_response.encode()
+            ))
+            if xxhash is not None:
+                return xxhash.xxh3_64_hexdigest(content)
+            return hashlib.sha256(content).hexdigest()
         except Exception:
             return str(uuid.uuid4())
     
     def to_text_representation(self) -> str:
-        """Convert snapshot to text for embedding."""
+        """Convert snapshot to text for embedding (cached after the first call)."""
+        if self._text is None:
+            object.__setattr__(self, "_text", self._build_text_representation())
+        return self._text
+    
+    def _build_text_representation(self) -> str:
+        """Serialize intent, plan, tools and response into embedding text."""
         try:
-            intent_str = json.dumps(self.user_intent)
-            plan_str = json.dumps(self.agent_plan)
-            tools_str = json.dumps([
-                {
-                    "tool": t.get("tool"), 
-                    "stdout": t.get("stdout", "")[:200]  # Truncate for embedding
-                } 
-                for t in self.tool_execution
-            ])
+            parts = [
+                "User Intent: ", _dumps(self.user_intent).decode(),
+                "\nAgent Plan: ", _dumps(self.agent_plan).decode(),
+                "\nTools: "
+            ]
+            used = sum(map(len, parts))
             
-            return f"""
-            User Intent: {intent_str}
-            Agent Plan: {plan_str}
-            Tools: {tools_str}
-            Response: {self.model_response[:500]}
-            """.strip()
+            # One "tool|stdout prefix" line per execution, until only the response reserve is left
+            tools_budget = MAX_TEXT_LENGTH - RESPONSE_RESERVE
+            sep = ""
+            for t in self.tool_execution:
+                line = f"{sep}{t.get('tool') or ''}|{(t.get('stdout') or '')[:200]}"
+                if used + len(line) > tools_budget:
+                    break
+                parts.append(line)
+                used += len(line)
+                sep = "\n"
+            
+            label = "\nResponse: "
+            parts.append(label)
+            used += len(label)
+            parts.append(self.model_response[:max(MAX_TEXT_LENGTH - used, 0)])
+            return "".join(parts)[:MAX_TEXT_LENGTH]
         except Exception:
             return f"Snapshot {self.id} (Error serializing)"
 
@@ -73,10 +138,36 @@ class SessionSnapshot:
 class ContextManager:
     """Manages session snapshots and semantic memory."""
     
-    def __init__(self, memory_manager):
-        """Initialize with memory manager reference."""
+    # ivfflat lists scanned per recall: about sqrt of the store's 100 lists
+    RECALL_PROBES = 10
+    
+    def __init__(self,
+                 memory_manager,
+                 batch_size: int = 32,
+                 flush_interval: float = 1.0,
+                 max_queued: int = 256):
+        """Initialize with memory manager reference and start the snapshot writer.
+        
+        Args:
+            memory_manager: MemoryManager owning the conversation retriever
+            batch_size: Maximum number of snapshots embedded and written together
+            flush_interval: Seconds to wait for more snapshots before writing a partial batch
+            max_queued: Queue bound; beyond it snapshots are written inline
+        """
         self.memory_manager = memory_manager
         # self.vector_store references the underlying pgvector store via memory_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[SessionSnapshot]" = queue.Queue(maxsize=max_queued)
+        # (query, k, ef_search, probes) -> results; cleared whenever new snapshots are written
+        self._recall_cache: "OrderedDict[Tuple[str, int, int, int], List[Dict[str, Any]]]" = OrderedDict()
+        self._recall_cache_size = 128
+        self._recall_lock = threading.Lock()
+        # session_id -> snapshots queued but not yet written (guarded by _recall_lock)
+        self._pending: Dict[str, int] = {}
+        self._thread = threading.Thread(target=self._writer_loop, name="snapshot-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
         
     def create_snapshot(self, 
                        session_id: str,
@@ -86,14 +177,21 @@ class ContextManager:
                        tool_outputs: List[Dict[str, Any]],
                        agent_plan: Optional[Dict[str, Any]] = None,
                        reasoning_summary: str = "",
-                       confidence: float = 1.0) -> SessionSnapshot:
-        """Create and save a new snapshot."""
+                       confidence: float = 1.0,
+                       verified_target: Optional[str] = None) -> SessionSnapshot:
+        """Create and save a new snapshot.
+        
+        verified_target skips the store lookup when the caller already knows
+        the conversation's target.
+        """
         
         # 1. Normalize User Intent (Mock logic or use IntentClassifier result if passed)
+        if verified_target is None:
+            verified_target = self.memory_manager.get_verified_target(conversation_id=session_id)
         user_intent = {
             "request": user_input,
             "task": "unknown", # TODO: Extract from classifier
-            "target": self.memory_manager.get_verified_target(conversation_id=session_id)
+            "target": verified_target
         }
         
         # 2. Normalize Plan
@@ -118,36 +216,171 @@ class ContextManager:
         return snapshot
 
     def _save_to_vector_store(self, snapshot: SessionSnapshot):
-        """Embed and save snapshot to pgvector."""
+        """Queue snapshot for the background writer.
+        
+        Only the snapshot itself is queued. Its text, hash and metadata are
+        built on the writer thread, so the turn does not pay for them.
+        """
+        with self._recall_lock:
+            self._pending[snapshot.session_id] = self._pending.get(snapshot.session_id, 0) + 1
         try:
-            vector_store = self.memory_manager.conversation_retriever.vectorstore
-            
-            text = snapshot.to_text_representation()
-            metadata = {
-                "snapshot_id": snapshot.id,
-                "session_id": snapshot.session_id,
-                "turn_id": snapshot.turn_id,
-                "type": "snapshot",
-                "reasoning_summary": snapshot.reasoning_summary,
-                "confidence": snapshot.confidence,
-                "hash": snapshot.snapshot_hash,
-                "timestamp": snapshot.timestamp
-            }
+            self._queue.put_nowait(snapshot)
+        except queue.Full:
+            # Writer is far behind (e.g. embedding model down); don't grow unbounded
+            self._write_batch([snapshot])
+    
+    def _writer_loop(self):
+        """Worker loop: drain up to batch_size snapshots and write them together."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    break
             
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    @staticmethod
+    def _snapshot_metadata(snapshot: SessionSnapshot) -> Dict[str, Any]:
+        """Build the vector-store metadata for a snapshot."""
+        return {
+            "snapshot_id": snapshot.id,
+            "session_id": snapshot.session_id,
+            "turn_id": snapshot.turn_id,
+            "type": "snapshot",
+            "reasoning_summary": snapshot.reasoning_summary,
+            "confidence": snapshot.confidence,
+            "hash": snapshot.snapshot_hash,
+            "timestamp": snapshot.timestamp
+        }
+    
+    def _write_batch(self, batch: List[SessionSnapshot]):
+        """Embed and write a batch of snapshots with a single add_documents call."""
+        if not batch:
+            return
+        try:
+            vector_store = self.memory_manager.conversation_retriever.vectorstore
             vector_store.add_documents(
-                texts=[text],
-                metadatas=[metadata],
-                ids=[snapshot.id]
+                texts=[snapshot.to_text_representation() for snapshot in batch],
+                metadatas=[self._snapshot_metadata(snapshot) for snapshot in batch],
+                ids=[snapshot.id for snapshot in batch]
             )
-            
         except Exception as e:
-            print(f"Failed to save snapshot to vector store: {e}")
+            print(f"Failed to save {len(batch)} snapshot(s) to vector store: {e}")
+        finally:
+            with self._recall_lock:
+                self._recall_cache.clear()
+                for snapshot in batch:
+                    left = self._pending.get(snapshot.session_id, 0) - 1
+                    if left > 0:
+                        self._pending[snapshot.session_id] = left
+                    else:
+                        self._pending.pop(snapshot.session_id, None)
+    
+    def flush(self):
+        """Block until every queued snapshot has been written (or failed)."""
+        if self._thread.is_alive():
+            self._queue.join()
+    
+    def _flush_if_pending(self, session_id: Optional[str]):
+        """Flush only if snapshots of this conversation are still queued.
+        
+        Args:
+            session_id: Conversation to check (default: the current conversation)
+        """
+        session_id = session_id or getattr(self.memory_manager, "conversation_id", None)
+        with self._recall_lock:
+            pending = self._pending.get(session_id, 0) if session_id else bool(self._pending)
+        if pending:
+            self.flush()
 
-    def recall_similar_snapshots(self, query: str, session_id: Optional[str] = None, k: int = 3):
-        """Retrieve similar past snapshots."""
+    def recall_similar_snapshots(self,
+                                 query: str,
+                                 session_id: Optional[str] = None,
+                                 k: int = 3,
+                                 ef_search: Optional[int] = None,
+                                 probes: Optional[int] = None):
+        """Retrieve similar past snapshots.
+        
+        Args:
+            query: Text to match against snapshot embeddings
+            session_id: Conversation whose queued snapshots must be searchable
+                (default: the current conversation)
+            k: Number of snapshots to return
+            ef_search: HNSW search breadth (default: max(40, k * 10))
+            probes: ivfflat lists scanned (default: RECALL_PROBES)
+        """
+        if not query or not query.strip():
+            return []
+        
         try:
+            if ef_search is None:
+                ef_search = max(40, k * 10)
+            if probes is None:
+                probes = self.RECALL_PROBES
+            
+            key = (query, k, ef_search, probes)
+            with self._recall_lock:
+                if key in self._recall_cache:
+                    self._recall_cache.move_to_end(key)
+                    return list(self._recall_cache[key])
+            
+            # This conversation's latest turns may still be queued; make them searchable
+            self._flush_if_pending(session_id)
             vector_store = self.memory_manager.conversation_retriever.vectorstore
-            return vector_store.similarity_search(query, k=k)
+            results = vector_store.similarity_search(query, k=k, ef_search=ef_search, probes=probes)
+            
+            with self._recall_lock:
+                self._recall_cache[key] = results
+                while len(self._recall_cache) > self._recall_cache_size:
+                    self._recall_cache.popitem(last=False)
+            return list(results)
             
         except Exception:
             return []
+    
+    def recall_similar_snapshots_batch(self,
+                                       queries: List[str],
+                                       k: int = 3,
+                                       ef_search: Optional[int] = None,
+                                       session_id: Optional[str] = None,
+                                       probes: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """Retrieve similar past snapshots for several queries at once.
+        
+        All queries are embedded in one call and searched in one SQL round trip.
+        
+        Args:
+            queries: Texts to match against snapshot embeddings
+            k: Number of snapshots to return per query
+            ef_search: HNSW search breadth (default: max(40, k * 10))
+            session_id: Conversation whose queued snapshots must be searchable
+                (default: the current conversation)
+            probes: ivfflat lists scanned (default: RECALL_PROBES)
+            
+        Returns:
+            One result list per query, in input order (blank queries get [])
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        live = [i for i, query in enumerate(queries) if query and query.strip()]
+        if not live:
+            return results
+        
+        try:
+            self._flush_if_pending(session_id)
+            if ef_search is None:
+                ef_search = max(40, k * 10)
+            vector_store = self.memory_manager.conversation_retriever.vectorstore
+            found = vector_store.similarity_search_batch(
+                [queries[i] for i in live], k=k, ef_search=ef_search,
+                probes=self.RECALL_PROBES if probes is None else probes
+            )
+            for i, hits in zip(live, found):
+                results[i] = hits
+        except Exception:
+            pass
+        return results
@@ -0,0 +1,150 @@
+"""Append-only write-ahead journal for conversation messages.
+
+Messages are appended as JSON lines to ~/.firestarter/conv/{conversation_id}.jsonl
+with a single os.write per record. The REPL journals the user prompt at the start
+of a turn instead of inserting it into PostgreSQL; once the completed turn is in
+the store a commit marker naming the journal entries it covers is appended.
+Once every entry is committed the file is removed, so journals stay as small as
+the turns in flight. Entries no commit marker covers (e.g. a turn interrupted or
+lost before it was written) are replayed into the ConversationStore when the
+journal is compacted, which MemoryManager does whenever a conversation is loaded.
+"""
+
+import os
+import json
+import threading
+from uuid import uuid4
+from typing import List, Dict, Any, Optional
+
+
+class ConversationJournal:
+    """Per-conversation JSONL write-ahead journal."""
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """Initialize conversation journal.
+
+        Args:
+            base_dir: Journal directory (default: $FIRESTARTER_JOURNAL_DIR or ~/.firestarter/conv)
+        """
+        self.base_dir = base_dir or os.getenv(
+            "FIRESTARTER_JOURNAL_DIR",
+            os.path.join(os.path.expanduser("~"), ".firestarter", "conv")
+        )
+        os.makedirs(self.base_dir, exist_ok=True)
+        # Commits run on the message writer thread; a file must not be removed
+        # between another thread's append and its commit
+        self._lock = threading.RLock()
+
+    def _path(self, conversation_id: str) -> str:
+        """Get journal file path for a conversation."""
+        return os.path.join(self.base_dir, f"{conversation_id}.jsonl")
+
+    def _append(self, conversation_id: str, record: Dict[str, Any]):
+        """Append one JSON record with a single write call."""
+        line = json.dumps(record, default=str).encode("utf-8") + b"\n"
+        with self._lock:
+            fd = os.open(self._path(conversation_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def append(self, conversation_id: str, role: str, content: str, metadata: Optional[Dict] = None) -> str:
+        """Journal a message that has not been persisted to the store yet.
+
+        Args:
+            conversation_id: Conversation UUID
+            role: Message role ('user', 'assistant', 'system')
+            content: Message content
+            metadata: Optional metadata dict
+
+        Returns:
+            Entry id to pass to mark_persisted once the message is in the store
+        """
+        entry_id = uuid4().hex
+        self._append(conversation_id, {
+            "type": "message",
+            "id": entry_id,
+            "role": role,
+            "content": content,
+            "metadata": metadata or {}
+        })
+        return entry_id
+
+    def mark_persisted(self, conversation_id: str, entry_ids: Optional[List[str]] = None):
+        """Record that journaled messages are in the store.
+
+        The journal file is removed once no entry in it is left pending.
+
+        Args:
+            conversation_id: Conversation UUID
+            entry_ids: Ids returned by append; None marks every entry so far
+        """
+        record: Dict[str, Any] = {"type": "commit"}
+        if entry_ids is not None:
+            record["ids"] = list(entry_ids)
+        with self._lock:
+            self._append(conversation_id, record)
+            if not self.pending(conversation_id):
+                self._remove(conversation_id)
+
+    def _remove(self, conversation_id: str):
+        path = self._path(conversation_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def pending(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Get journaled messages that no commit marker covers.
+
+        Args:
+            conversation_id: Conversation UUID
+
+        Returns:
+            List of message dicts with 'role', 'content' and 'metadata', in journal order
+        """
+        path = self._path(conversation_id)
+        with self._lock:
+            if not os.path.exists(path):
+                return []
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+
+        # entry id (or line number for entries without one) -> message
+        pending: Dict[Any, Dict[str, Any]] = {}
+        for lineno, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn final write from a crash; nothing after it is valid
+                break
+            if record.get("type") == "commit":
+                ids = record.get("ids")
+                if ids is None:
+                    pending.clear()
+                else:
+                    for entry_id in ids:
+                        pending.pop(entry_id, None)
+            elif record.get("type") == "message":
+                pending[record.get("id", lineno)] = {
+                    "role": record["role"],
+                    "content": record["content"],
+                    "metadata": record.get("metadata") or {}
+                }
+        return list(pending.values())
+
+    def compact(self, conversation_id: str, conversation_store) -> int:
+        """Replay pending messages into the store and truncate the journal.
+
+        Args:
+            conversation_id: Conversation UUID
+            conversation_store: ConversationStore to write pending messages to
+
+        Returns:
+            Number of messages replayed
+        """
+        with self._lock:
+            pending = self.pending(conversation_id)
+            if pending:
+                conversation_store.add_messages(conversation_id, pending)
+            self._remove(conversation_id)
+        return len(pending)
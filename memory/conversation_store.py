@@ -1,17 +1,169 @@
 """Persistent conversation store for production memory architecture."""
 
 import os
+import time
 import uuid
-from typing import Dict, Any, List, Optional
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
 import psycopg2
-from psycopg2.extras import RealDictCursor
-import json
+import psycopg2.pool
+import psycopg2.extras
+from psycopg2 import errors
+from psycopg2.extras import Json, RealDictCursor, execute_values
+from io import StringIO
+from memory._json import loads as json_loads
+
+# Decode JSONB columns to Python objects inside the driver (orjson when available),
+# so reads never see raw JSON strings
+psycopg2.extras.register_default_jsonb(loads=json_loads, globally=True)
+
+
+# Characters that must be escaped inside COPY ... (FORMAT text) fields
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_field(value: Optional[str]) -> str:
+    """Encode a value as a COPY ... (FORMAT text) field."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, Json):
+        value = value.dumps(value.adapted)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+# Transient conflicts worth retrying; the whole transaction is rolled back first
+RETRYABLE_ERRORS = (errors.DeadlockDetected, errors.SerializationFailure)
+
+
+def retry_on_deadlock(attempts: int = 3, backoff: float = 0.05):
+    """Retry a store method on deadlock/serialization failure.
+    
+    Each decorated method runs in its own transaction on a fresh pooled
+    connection, so re-running it after a rollback is safe.
+    
+    Args:
+        attempts: Total number of tries
+        backoff: Initial sleep in seconds, doubled after every failed try
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            delay = backoff
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except RETRYABLE_ERRORS:
+                    if attempt == attempts - 1:
+                        raise
+                    time.sleep(delay)
+                    delay *= 2
+        return wrapper
+    return decorator
+
+
+# Column order of the conversation metadata SELECTs
+_CONV_COLS = (
+    "id", "title", "created_at", "updated_at", "user_id", "metadata",
+    "summary", "session_id", "verified_target",
+)
+
+# Column order of every message SELECT; rows are zipped into dicts with it
+_MSG_COLS = ("id", "role", "content", "sequence_number", "created_at", "metadata")
+
+
+def _rows_to_messages(rows: List[Tuple]) -> List[Dict[str, Any]]:
+    """Build message dicts from plain-cursor rows selected in _MSG_COLS order."""
+    return [dict(zip(_MSG_COLS, row)) for row in rows]
 
 
 class ConversationStore:
     """Persistent store for conversation metadata and buffer."""
     
+    # Process-wide counter bumped on every committed conversation/message write.
+    # Shared by all store instances so readers can detect staleness cheaply.
+    _write_version = 0
+    
+    # Columns list_conversations may project; also guards the dynamic SELECT
+    CONVERSATION_COLUMNS = (
+        "id", "title", "created_at", "updated_at", "user_id", "metadata",
+        "summary", "session_id", "verified_target",
+    )
+    
+    # Bump whenever create_tables changes so existing databases pick up the new DDL
+    SCHEMA_VERSION = 7
+    # Key of idx_findings_dedupe; INSERTs into findings name it in ON CONFLICT
+    FINDINGS_CONFLICT_TARGET = "(conversation_id, type, md5(value), COALESCE(target, ''))"
+    # Hash partitions per conversation_id for conversation_messages/findings (fresh installs only)
+    TABLE_PARTITIONS = 16
+    # Pool keys whose database schema is known to be current in this process
+    _schema_checked: set = set()
+    
+    # Hot statements PREPAREd once per pooled connection: name -> (parameter types, SQL)
+    PREPARED_STATEMENTS = {
+        "stmt_get_conversation": ("uuid", """
+            SELECT id, title, created_at, updated_at, user_id, metadata, summary,
+                   session_id, verified_target
+            FROM conversations
+            WHERE id = $1
+        """),
+        "stmt_add_message": ("uuid, text, text, jsonb", """
+            WITH next_seq AS (
+                SELECT COALESCE(MAX(sequence_number), 0) + 1 AS n
+                FROM conversation_messages
+                WHERE conversation_id = $1
+            ),
+            ins AS (
+                INSERT INTO conversation_messages
+                (conversation_id, role, content, sequence_number, metadata, created_at)
+                SELECT $1, $2, $3, n, $4, NOW() FROM next_seq
+            )
+            UPDATE conversations
+            SET updated_at = NOW(), message_count = COALESCE(message_count, 0) + 1
+            WHERE id = $1
+        """),
+        "stmt_recent_messages": ("uuid, int", """
+            SELECT id, role, content, sequence_number, created_at, metadata
+            FROM conversation_messages
+            WHERE conversation_id = $1
+              AND sequence_number > (
+                  SELECT COALESCE(MAX(sequence_number), 0) - $2
+                  FROM conversation_messages
+                  WHERE conversation_id = $1
+              )
+            ORDER BY sequence_number ASC
+            LIMIT $2
+        """),
+        "stmt_message_count": ("uuid", """
+            SELECT COALESCE(message_count, (
+                SELECT COUNT(*) FROM conversation_messages WHERE conversation_id = $1
+            ))
+            FROM conversations
+            WHERE id = $1
+        """),
+    }
+    # connection -> names already prepared on it (entries vanish with the connection)
+    _prepared: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    _prepared_lock = threading.Lock()
+    
+    # Short-lived cache for get_message_count/get_recent_messages, keyed by conversation.
+    # Class-level so a write through any store instance invalidates it.
+    READ_CACHE_TTL = 30.0
+    READ_CACHE_SIZE = 1024
+    _read_cache: "OrderedDict[str, Dict[Tuple, Tuple[float, Any]]]" = OrderedDict()
+    _read_cache_lock = threading.Lock()
+    
+    # tool_results rows whose stdout exceeds this many characters are streamed with COPY
+    COPY_STDOUT_THRESHOLD = 64_000
+    
+    # Connection pools shared by every store instance with the same settings
+    _pools: Dict[Tuple, psycopg2.pool.ThreadedConnectionPool] = {}
+    _pools_lock = threading.Lock()
+    
     def __init__(self):
         """Initialize conversation store with PostgreSQL connection."""
         self.postgres_host = os.getenv("POSTGRES_HOST", "localhost")
@@ -19,14 +171,63 @@ class ConversationStore:
         self.postgres_database = os.getenv("POSTGRES_DATABASE", "firestarter_pg")
         self.postgres_user = os.getenv("POSTGRES_USER", "firestarter_ad")
         self.postgres_password = os.getenv("POSTGRES_PASSWORD", "")
+        self.pool_min_connections = int(os.getenv("POSTGRES_POOL_MIN", "1"))
+        self.pool_max_connections = int(os.getenv("POSTGRES_POOL_MAX", "20"))
         self.create_tables()
 
+    def _schema_current(self, cursor) -> bool:
+        """Check whether the database records SCHEMA_VERSION or newer."""
+        cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            return False
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+        version = cursor.fetchone()[0]
+        return version is not None and version >= self.SCHEMA_VERSION
+    
+    def _create_hash_partitions(self, cursor, table: str):
+        """Create the TABLE_PARTITIONS hash partitions of table, if it is partitioned.
+        
+        Tables created before partitioning was introduced are plain tables and
+        are left alone.
+        """
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", (table,))
+        if cursor.fetchone() is None:
+            return
+        for remainder in range(self.TABLE_PARTITIONS):
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table}_p{remainder}
+                PARTITION OF {table}
+                FOR VALUES WITH (MODULUS {self.TABLE_PARTITIONS}, REMAINDER {remainder});
+            """)
+    
     def create_tables(self):
-        """Ensure necessary tables exist."""
+        """Ensure necessary tables exist.
+        
+        The DDL only runs when the database's recorded schema version is older
+        than SCHEMA_VERSION, and at most once per process and database.
+        """
+        key = self._pool_key()
+        if key in ConversationStore._schema_checked:
+            return
+        
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
             
+            if self._schema_current(cursor):
+                conn.rollback()
+                cursor.close()
+                ConversationStore._schema_checked.add(key)
+                return
+            
+            # One worker runs the DDL at a time; the others wait, then find it done
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext('firestarter_schema'))")
+            if self._schema_current(cursor):
+                conn.commit()
+                cursor.close()
+                ConversationStore._schema_checked.add(key)
+                return
+            
             # Conversations table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS conversations (
@@ -42,18 +243,34 @@ class ConversationStore:
                 );
             """)
 
-            # Messages table
+            # Structured verified target, promoted out of metadata so reads need no JSON parsing
+            cursor.execute("""
+                ALTER TABLE conversations
+                    ADD COLUMN IF NOT EXISTS verified_target_legal_name TEXT,
+                    ADD COLUMN IF NOT EXISTS verified_target_country TEXT,
+                    ADD COLUMN IF NOT EXISTS verified_target_asn TEXT,
+                    ADD COLUMN IF NOT EXISTS verified_target_ip_ranges TEXT[],
+                    ADD COLUMN IF NOT EXISTS verified_target_confidence REAL;
+            """)
+
+            # Message counter maintained by add_message(s); backfilled below
+            cursor.execute("ALTER TABLE conversations ADD COLUMN IF NOT EXISTS message_count INTEGER;")
+
+            # Messages table, hash-partitioned by conversation_id (every query filters on it).
+            # The key must be part of the primary key; existing unpartitioned tables are kept.
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS conversation_messages (
-                    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
-                    conversation_id UUID REFERENCES conversations(id) ON DELETE CASCADE,
+                    id UUID DEFAULT gen_random_uuid(),
+                    conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
                     role TEXT,
                     content TEXT,
                     sequence_number INTEGER,
                     metadata JSONB,
-                    created_at TIMESTAMP DEFAULT NOW()
-                );
+                    created_at TIMESTAMP DEFAULT NOW(),
+                    PRIMARY KEY (conversation_id, id)
+                ) PARTITION BY HASH (conversation_id);
             """)
+            self._create_hash_partitions(cursor, "conversation_messages")
 
             # Tool Results table
             cursor.execute("""
@@ -68,21 +285,22 @@ class ConversationStore:
                 );
             """)
 
-            # Findings table
-            # Findings table
+            # Findings table, partitioned like conversation_messages
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS findings (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    conversation_id UUID REFERENCES conversations(id) ON DELETE CASCADE,
+                    id UUID DEFAULT gen_random_uuid(),
+                    conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
                     type TEXT,
                     value TEXT,
                     source_tool TEXT,
                     confidence FLOAT,
                     metadata JSONB,
                     target TEXT,
-                    created_at TIMESTAMP DEFAULT NOW()
-                );
+                    created_at TIMESTAMP DEFAULT NOW(),
+                    PRIMARY KEY (conversation_id, id)
+                ) PARTITION BY HASH (conversation_id);
             """)
+            self._create_hash_partitions(cursor, "findings")
 
             # Scan Tasks table for durable queue
             cursor.execute("""
@@ -99,35 +317,242 @@ class ConversationStore:
                     priority INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT NOW(),
                     updated_at TIMESTAMP DEFAULT NOW()
-                );
+                ) WITH (fillfactor = 85);
+            """)
+            # Leave room on each page for the status/result updates every task goes through
+            cursor.execute("ALTER TABLE scan_tasks SET (fillfactor = 85);")
+
+            # Backfill message_count for conversations that predate the counter
+            cursor.execute("""
+                UPDATE conversations c
+                SET message_count = (
+                    SELECT COUNT(*) FROM conversation_messages m WHERE m.conversation_id = c.id
+                )
+                WHERE message_count IS NULL;
             """)
 
             # Indexes for performance
+            # Same names as database/schema.sql so applying both doesn't duplicate them.
+            # (conversation_id, sequence_number) serves MAX/COUNT, paging and the
+            # recent-window query (scanned backwards).
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_messages_conversation ON conversation_messages(conversation_id, sequence_number);")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_updated ON conversations(updated_at);")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tool_results_conversation_id ON tool_results(conversation_id, created_at);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_findings_conversation_id ON findings(conversation_id);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_findings_type ON findings(type);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_tool_results_tool_name ON tool_results(tool_name);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_findings_target ON findings(target);")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_scan_tasks_conversation_id ON scan_tasks(conversation_id);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scan_tasks_status ON scan_tasks(status);")
+            # Dequeue index covering only pending tasks (done/error rows never enter it)
+            cursor.execute("DROP INDEX IF EXISTS idx_scan_tasks_status;")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scan_tasks_pending
+                ON scan_tasks(priority DESC, created_at)
+                INCLUDE (conversation_id, host, tool_name)
+                WHERE status = 'pending';
+            """)
+            # At most one queued/running task per (conversation, host, tool, command), so
+            # add_targets' ON CONFLICT skips targets already in flight; finished tasks are
+            # outside the index and can be rescanned. Existing active duplicates are resolved
+            # first: extra pending copies are dropped, extra running copies marked as errors.
+            cursor.execute("DROP INDEX IF EXISTS idx_scan_tasks_unique;")
+            cursor.execute("""
+                WITH ranked AS (
+                    SELECT id, status, ROW_NUMBER() OVER (
+                        PARTITION BY conversation_id, host, tool_name, COALESCE(command_name, '')
+                        ORDER BY (status = 'scanning') DESC, created_at, id
+                    ) AS rn
+                    FROM scan_tasks
+                    WHERE status IN ('pending', 'scanning')
+                      AND conversation_id IS NOT NULL AND tool_name IS NOT NULL
+                ),
+                dropped AS (
+                    DELETE FROM scan_tasks t
+                    USING ranked r
+                    WHERE t.id = r.id AND r.rn > 1 AND r.status = 'pending'
+                )
+                UPDATE scan_tasks t
+                SET status = 'error', error = 'duplicate of an active task', updated_at = NOW()
+                FROM ranked r
+                WHERE t.id = r.id AND r.rn > 1 AND r.status = 'scanning';
+            """)
+            cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_scan_tasks_active_unique
+                ON scan_tasks(conversation_id, host, tool_name, COALESCE(command_name, ''))
+                WHERE status IN ('pending', 'scanning');
+            """)
+            # Containment (@>) lookups on metadata; jsonb_path_ops is about half the size of jsonb_ops
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_metadata_gin ON conversations USING gin (metadata jsonb_path_ops);")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_findings_metadata_gin ON findings USING gin (metadata jsonb_path_ops);")
+
+            # One row per (conversation, type, value, target). The value is indexed by
+            # its md5 since banners and bodies exceed the btree row limit, and a NULL
+            # target counts as ''. Duplicates from earlier versions are dropped first,
+            # keeping the oldest copy.
+            cursor.execute("DROP INDEX IF EXISTS idx_findings_unique;")
+            cursor.execute("""
+                DELETE FROM findings f
+                USING findings d
+                WHERE f.conversation_id = d.conversation_id
+                  AND f.type = d.type
+                  AND md5(f.value) = md5(d.value)
+                  AND COALESCE(f.target, '') = COALESCE(d.target, '')
+                  AND (f.created_at, f.id) > (d.created_at, d.id);
+            """)
+            cursor.execute(f"""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_findings_dedupe
+                ON findings{self.FINDINGS_CONFLICT_TARGET};
+            """)
+
+            # Substring search on finding values (search_findings). pg_trgm may need
+            # privileges this role lacks, so a failure here doesn't abort the schema.
+            cursor.execute("SAVEPOINT trgm;")
+            try:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_findings_value_trgm ON findings USING gin (value gin_trgm_ops);")
+                cursor.execute("RELEASE SAVEPOINT trgm;")
+            except psycopg2.Error as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT trgm;")
+                import warnings
+                warnings.warn(f"pg_trgm unavailable, finding search will not be indexed: {e}")
+
+            # Record the version so later starts skip the DDL above
+            cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL);")
+            cursor.execute("DELETE FROM schema_version;")
+            cursor.execute("INSERT INTO schema_version (version) VALUES (%s);", (self.SCHEMA_VERSION,))
 
             conn.commit()
             cursor.close()
+            ConversationStore._schema_checked.add(key)
         except Exception as e:
             conn.rollback()
             import warnings
             warnings.warn(f"Failed to create tables: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
+    
+    @classmethod
+    def _bump_write_version(cls):
+        """Record that conversation data changed."""
+        cls._write_version += 1
+    
+    @classmethod
+    def write_version(cls) -> int:
+        """Get the current write version (changes whenever conversation data is written).
+        
+        Returns:
+            Monotonically increasing write counter
+        """
+        return cls._write_version
+    
+    @classmethod
+    def _cache_get(cls, conversation_id: str, key: Tuple) -> Optional[Any]:
+        """Get a cached read result, or None if missing or expired."""
+        with cls._read_cache_lock:
+            entries = cls._read_cache.get(conversation_id)
+            entry = entries.get(key) if entries else None
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del entries[key]
+                return None
+            cls._read_cache.move_to_end(conversation_id)
+            return entry[1]
+    
+    @classmethod
+    def _cache_put(cls, conversation_id: str, key: Tuple, value: Any):
+        """Cache a read result for READ_CACHE_TTL seconds."""
+        with cls._read_cache_lock:
+            cls._read_cache.setdefault(conversation_id, {})[key] = (time.monotonic() + cls.READ_CACHE_TTL, value)
+            cls._read_cache.move_to_end(conversation_id)
+            while len(cls._read_cache) > cls.READ_CACHE_SIZE:
+                cls._read_cache.popitem(last=False)
+    
+    @classmethod
+    def _invalidate_cache(cls, *conversation_ids: str):
+        """Drop cached reads for the given conversations."""
+        with cls._read_cache_lock:
+            for conversation_id in conversation_ids:
+                cls._read_cache.pop(conversation_id, None)
+    
+    def _execute_prepared(self, cursor, name: str, params: Tuple):
+        """Execute a PREPARED_STATEMENTS entry, preparing it on first use per connection.
+        
+        Prepared statements live for the whole database session and survive
+        rollbacks, so each pooled connection parses and plans them only once.
+        
+        Args:
+            cursor: Cursor of a pooled connection
+            name: Key of PREPARED_STATEMENTS
+            params: Statement parameters
+        """
+        with ConversationStore._prepared_lock:
+            prepared = ConversationStore._prepared.setdefault(cursor.connection, set())
+        if name not in prepared:
+            types, sql = self.PREPARED_STATEMENTS[name]
+            cursor.execute(f"PREPARE {name} ({types}) AS {sql}")
+            prepared.add(name)
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    
+    def _pool_key(self) -> Tuple:
+        """Connection settings identifying this store's shared pool."""
+        return (self.postgres_host, self.postgres_port, self.postgres_database,
+                self.postgres_user, self.postgres_password)
+    
+    def _get_pool(self) -> psycopg2.pool.ThreadedConnectionPool:
+        """Get (creating on first use) the connection pool for this store's settings."""
+        key = self._pool_key()
+        pool = ConversationStore._pools.get(key)
+        if pool is None:
+            with ConversationStore._pools_lock:
+                pool = ConversationStore._pools.get(key)
+                if pool is None:
+                    pool = psycopg2.pool.ThreadedConnectionPool(
+                        self.pool_min_connections,
+                        self.pool_max_connections,
+                        host=self.postgres_host,
+                        port=self.postgres_port,
+                        database=self.postgres_database,
+                        user=self.postgres_user,
+                        password=self.postgres_password
+                    )
+                    ConversationStore._pools[key] = pool
+        return pool
     
     def _get_connection(self):
-        """Get PostgreSQL connection."""
-        return psycopg2.connect(
-            host=self.postgres_host,
-            port=self.postgres_port,
-            database=self.postgres_database,
-            user=self.postgres_user,
-            password=self.postgres_password
-        )
+        """Check out a PostgreSQL connection from the pool.
+        
+        Every connection must be handed back with _put_connection.
+        """
+        return self._get_pool().getconn()
+    
+    def _put_connection(self, conn):
+        """Return a connection to the pool (open transactions are rolled back).
+        
+        Args:
+            conn: Connection obtained from _get_connection
+        """
+        self._get_pool().putconn(conn, close=bool(conn.closed))
+    
+    @contextmanager
+    def _conn(self):
+        """Context manager yielding a pooled connection."""
+        conn = self._get_connection()
+        try:
+            yield conn
+        finally:
+            self._put_connection(conn)
+    
+    def close(self):
+        """Close every connection in this store's pool.
+        
+        The pool is shared with other stores using the same settings; it is
+        recreated on next use.
+        """
+        with ConversationStore._pools_lock:
+            pool = ConversationStore._pools.pop(self._pool_key(), None)
+        if pool is not None:
+            pool.closeall()
     
     def create_conversation(self, title: Optional[str] = None, session_id: Optional[str] = None) -> str:
         """Create new conversation, return conversation_id.
@@ -139,25 +564,50 @@ class ConversationStore:
         Returns:
             conversation_id (UUID string)
         """
+        return self.create_conversation_record(title=title, session_id=session_id)["id"]
+    
+    @retry_on_deadlock()
+    def create_conversation_record(self,
+                                   title: Optional[str] = None,
+                                   session_id: Optional[str] = None,
+                                   verified_target: Optional[str] = None) -> Dict[str, Any]:
+        """Create new conversation and return its full metadata row.
+        
+        The row comes back from INSERT ... RETURNING, so callers need no
+        follow-up get_conversation.
+        
+        Args:
+            title: Optional conversation title
+            session_id: Optional legacy session_id for migration
+            verified_target: Optional verified target domain
+            
+        Returns:
+            Conversation metadata dict (same keys as get_conversation)
+        """
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
             conversation_id = str(uuid.uuid4())
             
-            cursor.execute("""
-                INSERT INTO conversations (id, title, session_id, created_at, updated_at)
-                VALUES (%s, %s, %s, NOW(), NOW())
-                RETURNING id
-            """, (conversation_id, title, session_id))
+            cursor.execute(f"""
+                INSERT INTO conversations
+                (id, title, session_id, verified_target, message_count, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, 0, NOW(), NOW())
+                RETURNING {", ".join(_CONV_COLS)}
+            """, (conversation_id, title, session_id, verified_target))
+            
+            conversation = dict(zip(_CONV_COLS, cursor.fetchone()))
+            conversation["id"] = conversation_id
             
             conn.commit()
+            ConversationStore._bump_write_version()
             cursor.close()
-            return conversation_id
-        except Exception as e:
+            return conversation
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to create conversation: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
     
     def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """Get conversation metadata.
@@ -171,12 +621,7 @@ class ConversationStore:
         conn = self._get_connection()
         try:
             cursor = conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute("""
-                SELECT id, title, created_at, updated_at, user_id, metadata, summary, 
-                       session_id, verified_target
-                FROM conversations
-                WHERE id = %s
-            """, (conversation_id,))
+            self._execute_prepared(cursor, "stmt_get_conversation", (conversation_id,))
             
             row = cursor.fetchone()
             cursor.close()
@@ -184,27 +629,104 @@ class ConversationStore:
             if row:
                 return dict(row)
             return None
-        except Exception as e:
-            raise Exception(f"Failed to get conversation: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
     
-    def list_conversations(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    def get_conversation_bundle(self, conversation_id: str, k: int = 10) -> Optional[Dict[str, Any]]:
+        """Get conversation metadata, message count and last K messages in one query.
+        
+        Replaces separate get_conversation / get_message_count /
+        get_recent_messages calls (three round trips) when a caller needs all
+        of them.
+        
+        Args:
+            conversation_id: Conversation UUID
+            k: Number of recent messages to return (0 for none)
+            
+        Returns:
+            Dict with 'conversation', 'message_count' and 'recent_messages'
+            (chronological), or None if the conversation does not exist
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            # One row per recent message (or a single row with NULL message
+            # columns), each carrying the conversation columns
+            cursor.execute("""
+                SELECT c.id, c.title, c.created_at, c.updated_at, c.user_id, c.metadata,
+                       c.summary, c.session_id, c.verified_target,
+                       COALESCE(c.message_count, (
+                           SELECT COUNT(*) FROM conversation_messages WHERE conversation_id = c.id
+                       )),
+                       m.id, m.role, m.content, m.sequence_number, m.created_at, m.metadata
+                FROM conversations c
+                LEFT JOIN LATERAL (
+                    SELECT id, role, content, sequence_number, created_at, metadata
+                    FROM conversation_messages
+                    WHERE conversation_id = c.id
+                    ORDER BY sequence_number DESC
+                    LIMIT %s
+                ) m ON TRUE
+                WHERE c.id = %s
+                ORDER BY m.sequence_number ASC
+            """, (k, conversation_id))
+            
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            if not rows:
+                return None
+            
+            conv_columns = len(_CONV_COLS)
+            first = rows[0]
+            conversation = dict(zip(_CONV_COLS, first[:conv_columns]))
+            message_count = first[conv_columns]
+            recent_messages = _rows_to_messages(
+                [row[conv_columns + 1:] for row in rows if row[conv_columns + 1] is not None]
+            )
+            
+            self._cache_put(conversation_id, ("count",), message_count)
+            if k:
+                self._cache_put(conversation_id, ("recent", k), recent_messages)
+            return {
+                "conversation": conversation,
+                "message_count": message_count,
+                "recent_messages": [dict(msg) for msg in recent_messages]
+            }
+        finally:
+            self._put_connection(conn)
+    
+    def list_conversations(self,
+                           limit: int = 50,
+                           offset: int = 0,
+                           fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """List all conversations.
         
         Args:
             limit: Maximum number of conversations to return
             offset: Offset for pagination
+            fields: Optional subset of CONVERSATION_COLUMNS to select.
+                Defaults to all columns.
             
         Returns:
             List of conversation metadata dicts
+            
+        Raises:
+            ValueError: If fields contains an unknown column
         """
+        if fields:
+            unknown = [f for f in fields if f not in self.CONVERSATION_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown conversation column(s): {', '.join(unknown)}")
+            columns = ", ".join(fields)
+        else:
+            columns = ", ".join(self.CONVERSATION_COLUMNS)
+        
         conn = self._get_connection()
         try:
             cursor = conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute("""
-                SELECT id, title, created_at, updated_at, user_id, metadata, summary,
-                       session_id, verified_target
+            cursor.execute(f"""
+                SELECT {columns}
                 FROM conversations
                 ORDER BY updated_at DESC
                 LIMIT %s OFFSET %s
@@ -214,11 +736,45 @@ class ConversationStore:
             cursor.close()
             
             return [dict(row) for row in rows]
-        except Exception as e:
-            raise Exception(f"Failed to list conversations: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
     
+    def find_conversations_by_metadata(self,
+                                       key: str,
+                                       value: Any,
+                                       limit: int = 50) -> List[Dict[str, Any]]:
+        """Find conversations whose metadata contains key = value.
+        
+        Uses JSONB containment (metadata @> '{"key": value}') so the GIN index
+        on conversations.metadata is used.
+        
+        Args:
+            key: Top-level metadata key
+            value: JSON-serializable value to match (dicts match as subsets)
+            limit: Maximum number of conversations to return
+            
+        Returns:
+            List of conversation metadata dicts, most recently updated first
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(f"""
+                SELECT {", ".join(self.CONVERSATION_COLUMNS)}
+                FROM conversations
+                WHERE metadata @> %s::jsonb
+                ORDER BY updated_at DESC
+                LIMIT %s
+            """, (Json({key: value}), limit))
+            
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return [dict(row) for row in rows]
+        finally:
+            self._put_connection(conn)
+    
+    @retry_on_deadlock()
     def update_conversation_title(self, conversation_id: str, title: str):
         """Update conversation title.
         
@@ -236,13 +792,15 @@ class ConversationStore:
             """, (title, conversation_id))
             
             conn.commit()
+            ConversationStore._bump_write_version()
             cursor.close()
-        except Exception as e:
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to update conversation title: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
     
+    @retry_on_deadlock()
     def update_conversation_summary(self, conversation_id: str, summary: str):
         """Update conversation summary (compressed history).
         
@@ -260,13 +818,15 @@ class ConversationStore:
             """, (summary, conversation_id))
             
             conn.commit()
+            ConversationStore._bump_write_version()
             cursor.close()
-        except Exception as e:
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to update conversation summary: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
     
+    @retry_on_deadlock()
     def update_verified_target(self, conversation_id: str, target: str, structured_info: Optional[Dict] = None):
         """Update verified target for conversation.
         
@@ -287,18 +847,26 @@ class ConversationStore:
             
             # Store both simple domain (for backward compatibility) and structured info
             if structured_info:
-                # Store structured info in metadata JSONB field
+                asn = structured_info.get("asn")
                 cursor.execute("""
                     UPDATE conversations
                     SET verified_target = %s,
-                        metadata = jsonb_set(
-                            COALESCE(metadata, '{}'::jsonb),
-                            '{verified_target_structured}',
-                            %s::jsonb
-                        ),
+                        verified_target_legal_name = %s,
+                        verified_target_country = %s,
+                        verified_target_asn = %s,
+                        verified_target_ip_ranges = %s,
+                        verified_target_confidence = %s,
                         updated_at = NOW()
                     WHERE id = %s
-                """, (target, json.dumps(structured_info), conversation_id))
+                """, (
+                    target,
+                    structured_info.get("legal_name", ""),
+                    structured_info.get("country", ""),
+                    str(asn) if asn is not None else None,
+                    list(structured_info.get("ip_ranges") or []),
+                    structured_info.get("confidence", 0.5),
+                    conversation_id
+                ))
             else:
                 # Just update domain (backward compatible)
                 cursor.execute("""
@@ -308,12 +876,13 @@ class ConversationStore:
                 """, (target, conversation_id))
             
             conn.commit()
+            ConversationStore._bump_write_version()
             cursor.close()
-        except Exception as e:
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to update verified target: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
     
     def get_verified_target(self, conversation_id: str, structured: bool = False) -> Optional[Any]:
         """Get verified target for conversation.
@@ -328,8 +897,28 @@ class ConversationStore:
         conn = self._get_connection()
         try:
             cursor = conn.cursor(cursor_factory=RealDictCursor)
+            if not structured:
+                # Backward compatible: return domain string
+                cursor.execute("""
+                    SELECT verified_target
+                    FROM conversations
+                    WHERE id = %s
+                """, (conversation_id,))
+                row = cursor.fetchone()
+                cursor.close()
+                return row.get('verified_target') if row else None
+            
+            # Rows written before the typed columns existed keep their info in metadata
             cursor.execute("""
-                SELECT verified_target, metadata
+                SELECT verified_target,
+                       verified_target_legal_name,
+                       verified_target_country,
+                       verified_target_asn,
+                       verified_target_ip_ranges,
+                       verified_target_confidence,
+                       CASE WHEN verified_target_confidence IS NULL
+                            THEN metadata->'verified_target_structured'
+                       END AS legacy_structured
                 FROM conversations
                 WHERE id = %s
             """, (conversation_id,))
@@ -340,39 +929,36 @@ class ConversationStore:
             if not row:
                 return None
             
-            if structured:
-                # Return structured info if available
-                metadata = row.get('metadata') or {}
-                if isinstance(metadata, str):
-                    try:
-                        metadata = json.loads(metadata)
-                    except:
-                        metadata = {}
-                
-                structured_info = metadata.get('verified_target_structured')
-                if structured_info:
-                    return structured_info
-                
-                # Fallback: return simple dict with domain
-                domain = row.get('verified_target')
-                if domain:
-                    return {
-                        "domain": domain,
-                        "legal_name": "",
-                        "country": "",
-                        "asn": None,
-                        "ip_ranges": [],
-                        "confidence": 0.5
-                    }
-                return None
-            else:
-                # Backward compatible: return domain string
-                return row.get('verified_target')
-        except Exception as e:
-            raise Exception(f"Failed to get verified target: {e}")
+            domain = row.get('verified_target')
+            if row.get('verified_target_confidence') is not None:
+                return {
+                    "domain": domain,
+                    "legal_name": row.get('verified_target_legal_name') or "",
+                    "country": row.get('verified_target_country') or "",
+                    "asn": row.get('verified_target_asn'),
+                    "ip_ranges": row.get('verified_target_ip_ranges') or [],
+                    "confidence": row['verified_target_confidence']
+                }
+            
+            legacy = row.get('legacy_structured')
+            if legacy:
+                return legacy
+            
+            # Fallback: return simple dict with domain
+            if domain:
+                return {
+                    "domain": domain,
+                    "legal_name": "",
+                    "country": "",
+                    "asn": None,
+                    "ip_ranges": [],
+                    "confidence": 0.5
+                }
+            return None
         finally:
-            conn.close()
+            self._put_connection(conn)
     
+    @retry_on_deadlock()
     def add_message(self, conversation_id: str, role: str, content: str, metadata: Optional[Dict] = None):
         """Add message to conversation buffer.
         
@@ -386,128 +972,215 @@ class ConversationStore:
         try:
             cursor = conn.cursor()
             
-            # Get next sequence number
-            cursor.execute("""
-                SELECT COALESCE(MAX(sequence_number), 0) + 1
-                FROM conversation_messages
-                WHERE conversation_id = %s
-            """, (conversation_id,))
+            # Next sequence number, insert and conversation touch in one round trip
+            self._execute_prepared(
+                cursor, "stmt_add_message", (conversation_id, role, content, Json(metadata or {}))
+            )
             
-            sequence_number = cursor.fetchone()[0]
+            conn.commit()
+            ConversationStore._bump_write_version()
+            ConversationStore._invalidate_cache(conversation_id)
+            cursor.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._put_connection(conn)
+    
+    def add_messages(self, conversation_id: str, messages: List[Dict[str, Any]]):
+        """Add several messages to a conversation in a single transaction.
+        
+        Args:
+            conversation_id: Conversation UUID
+            messages: Message dicts with 'role', 'content' and optional 'metadata',
+                stored in the given order
+        """
+        self.add_messages_bulk([
+            (conversation_id, message["role"], message["content"], message.get("metadata"))
+            for message in messages
+        ])
+    
+    @retry_on_deadlock()
+    def add_messages_bulk(self, messages: List[Tuple[str, str, str, Optional[Dict]]]):
+        """Add messages for any number of conversations in a single transaction.
+        
+        Args:
+            messages: (conversation_id, role, content, metadata) tuples; order is
+                preserved within each conversation
+        """
+        if not messages:
+            return
+        
+        by_conversation: Dict[str, List[Tuple[str, str, Optional[Dict]]]] = {}
+        for conversation_id, role, content, metadata in messages:
+            by_conversation.setdefault(conversation_id, []).append((role, content, metadata))
+        
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
             
-            # Insert message
-            metadata_json = json.dumps(metadata or {})
+            # Next sequence number for every conversation in one query
             cursor.execute("""
+                SELECT c.id, COALESCE(MAX(m.sequence_number), 0) + 1
+                FROM unnest(%s::text[]) AS c(id)
+                LEFT JOIN conversation_messages m ON m.conversation_id = c.id::uuid
+                GROUP BY c.id
+            """, (list(by_conversation),))
+            next_sequence = dict(cursor.fetchall())
+            
+            values = [
+                (conversation_id, role, content, next_sequence[conversation_id] + offset, Json(metadata or {}))
+                for conversation_id, rows in by_conversation.items()
+                for offset, (role, content, metadata) in enumerate(rows)
+            ]
+            execute_values(cursor, """
                 INSERT INTO conversation_messages 
-                (conversation_id, role, content, sequence_number, metadata, created_at)
-                VALUES (%s, %s, %s, %s, %s, NOW())
-            """, (conversation_id, role, content, sequence_number, metadata_json))
+                (conversation_id, role, content, sequence_number, metadata)
+                VALUES %s
+            """, values, page_size=500)
             
-            # Update conversation updated_at
             cursor.execute("""
-                UPDATE conversations
-                SET updated_at = NOW()
-                WHERE id = %s
-            """, (conversation_id,))
+                UPDATE conversations c
+                SET updated_at = NOW(), message_count = COALESCE(c.message_count, 0) + v.n
+                FROM unnest(%s::uuid[], %s::int[]) AS v(id, n)
+                WHERE c.id = v.id
+            """, (list(by_conversation), [len(rows) for rows in by_conversation.values()]))
             
             conn.commit()
+            ConversationStore._bump_write_version()
+            ConversationStore._invalidate_cache(*by_conversation)
             cursor.close()
-        except Exception as e:
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to add message: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
     
-    def get_messages(self, conversation_id: str, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    def get_messages(self,
+                     conversation_id: str,
+                     limit: Optional[int] = None,
+                     offset: int = 0,
+                     after_sequence: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get messages with pagination support.
         
+        Prefer after_sequence (keyset pagination) over offset for paging: pass
+        the sequence_number of the last message already seen. It costs the
+        same at any depth, while offset scans and discards the skipped rows.
+        
         Args:
             conversation_id: Conversation UUID
             limit: Maximum number of messages (None for all)
             offset: Offset for pagination
+            after_sequence: Only return messages with a greater sequence_number
             
         Returns:
             List of message dicts ordered by sequence_number
         """
+        if not limit and not offset:
+            # Whole history: stream it rather than buffering the full result twice
+            return list(self.iter_messages(conversation_id, after_sequence=after_sequence))
+        
         conn = self._get_connection()
         try:
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT id, role, content, sequence_number, created_at, metadata
+                FROM conversation_messages
+                WHERE conversation_id = %s
+            """
+            params: List[Any] = [conversation_id]
+            
+            if after_sequence is not None:
+                query += " AND sequence_number > %s"
+                params.append(after_sequence)
+            
+            query += " ORDER BY sequence_number ASC"
             
             if limit:
-                cursor.execute("""
-                    SELECT id, role, content, sequence_number, created_at, metadata
-                    FROM conversation_messages
-                    WHERE conversation_id = %s
-                    ORDER BY sequence_number ASC
-                    LIMIT %s OFFSET %s
-                """, (conversation_id, limit, offset))
-            else:
-                cursor.execute("""
-                    SELECT id, role, content, sequence_number, created_at, metadata
-                    FROM conversation_messages
-                    WHERE conversation_id = %s
-                    ORDER BY sequence_number ASC
-                    OFFSET %s
-                """, (conversation_id, offset))
+                query += " LIMIT %s"
+                params.append(limit)
+            if offset:
+                query += " OFFSET %s"
+                params.append(offset)
             
-            rows = cursor.fetchall()
-            cursor.close()
+            cursor.execute(query, tuple(params))
             
-            messages = []
-            for row in rows:
-                msg = dict(row)
-                if msg.get('metadata'):
-                    try:
-                        msg['metadata'] = json.loads(msg['metadata']) if isinstance(msg['metadata'], str) else msg['metadata']
-                    except:
-                        msg['metadata'] = {}
-                messages.append(msg)
+            messages = _rows_to_messages(cursor.fetchall())
+            cursor.close()
             
             return messages
-        except Exception as e:
-            raise Exception(f"Failed to get messages: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
     
-    def get_recent_messages(self, conversation_id: str, k: int = 10) -> List[Dict[str, Any]]:
-        """Get last K messages (sliding window).
+    def iter_messages(self,
+                      conversation_id: str,
+                      after_sequence: Optional[int] = None,
+                      itersize: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream messages in sequence order through a server-side cursor.
+        
+        Rows arrive itersize at a time, so memory stays bounded however long
+        the conversation is. The pooled connection is held until the iterator
+        is exhausted or closed.
         
         Args:
             conversation_id: Conversation UUID
-            k: Number of recent messages to return
+            after_sequence: Only return messages with a greater sequence_number
+            itersize: Rows fetched per network round trip
             
-        Returns:
-            List of message dicts (most recent first, then reversed to chronological order)
+        Yields:
+            Message dicts ordered by sequence_number
         """
         conn = self._get_connection()
         try:
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute("""
+            cursor = conn.cursor(name=f"msgs_{uuid.uuid4().hex}")
+            cursor.itersize = itersize
+            
+            query = """
                 SELECT id, role, content, sequence_number, created_at, metadata
                 FROM conversation_messages
                 WHERE conversation_id = %s
-                ORDER BY sequence_number DESC
-                LIMIT %s
-            """, (conversation_id, k))
+            """
+            params: List[Any] = [conversation_id]
+            if after_sequence is not None:
+                query += " AND sequence_number > %s"
+                params.append(after_sequence)
+            query += " ORDER BY sequence_number ASC"
             
-            rows = cursor.fetchall()
+            cursor.execute(query, tuple(params))
+            for row in cursor:
+                yield _rows_to_messages([row])[0]
             cursor.close()
+        finally:
+            self._put_connection(conn)
+    
+    def get_recent_messages(self, conversation_id: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Get last K messages (sliding window).
+        
+        Args:
+            conversation_id: Conversation UUID
+            k: Number of recent messages to return
             
-            messages = []
-            for row in reversed(rows):  # Reverse to get chronological order
-                msg = dict(row)
-                if msg.get('metadata'):
-                    try:
-                        msg['metadata'] = json.loads(msg['metadata']) if isinstance(msg['metadata'], str) else msg['metadata']
-                    except:
-                        msg['metadata'] = {}
-                messages.append(msg)
+        Returns:
+            List of message dicts in chronological order
+        """
+        cached = self._cache_get(conversation_id, ("recent", k))
+        if cached is not None:
+            return [dict(msg) for msg in cached]
+        
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            # Keyset window over the last k sequence numbers, already in chronological order
+            self._execute_prepared(cursor, "stmt_recent_messages", (conversation_id, k))
             
-            return messages
-        except Exception as e:
-            raise Exception(f"Failed to get recent messages: {e}")
+            messages = _rows_to_messages(cursor.fetchall())
+            cursor.close()
+            
+            self._cache_put(conversation_id, ("recent", k), messages)
+            return [dict(msg) for msg in messages]
         finally:
-            conn.close()
+            self._put_connection(conn)
     
     def get_message_count(self, conversation_id: str) -> int:
         """Get total message count for conversation.
@@ -518,22 +1191,25 @@ class ConversationStore:
         Returns:
             Total number of messages
         """
+        cached = self._cache_get(conversation_id, ("count",))
+        if cached is not None:
+            return cached
+        
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) FROM conversation_messages
-                WHERE conversation_id = %s
-            """, (conversation_id,))
+            # Maintained counter; COUNT(*) only for rows not yet backfilled
+            self._execute_prepared(cursor, "stmt_message_count", (conversation_id,))
             
-            count = cursor.fetchone()[0]
+            row = cursor.fetchone()
             cursor.close()
+            count = row[0] if row else 0
+            self._cache_put(conversation_id, ("count",), count)
             return count
-        except Exception as e:
-            raise Exception(f"Failed to get message count: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
     
+    @retry_on_deadlock()
     def delete_conversation(self, conversation_id: str):
         """Delete conversation and all associated data (CASCADE).
         
@@ -549,12 +1225,14 @@ class ConversationStore:
             """, (conversation_id,))
             
             conn.commit()
+            ConversationStore._bump_write_version()
+            ConversationStore._invalidate_cache(conversation_id)
             cursor.close()
-        except Exception as e:
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to delete conversation: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
     
 
     def get_conversation_by_session_id(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -582,10 +1260,8 @@ class ConversationStore:
             if row:
                 return dict(row)
             return None
-        except Exception as e:
-            raise Exception(f"Failed to get conversation by session_id: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
 
     # ==================== Findings & Tool Results ====================
 
@@ -607,25 +1283,64 @@ class ConversationStore:
         Returns:
             Result UUID
         """
+        return self.add_tool_results_bulk(conversation_id, [(tool_name, command, stdout, parsed_data)])[0]
+
+    @retry_on_deadlock()
+    def add_tool_results_bulk(self,
+                              conversation_id: str,
+                              results: List[Tuple[str, str, str, Optional[Dict]]]) -> List[str]:
+        """Add several tool execution results in one INSERT.
+        
+        Args:
+            conversation_id: Conversation UUID
+            results: (tool_name, command, stdout, parsed_data) tuples
+            
+        Returns:
+            Result UUIDs, in input order
+        """
+        if not results:
+            return []
+        
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
-            result_id = str(uuid.uuid4())
-            parsed_json = json.dumps(parsed_data) if parsed_data else None
+            # Re-derivable tool output: don't wait for the WAL fsync on commit
+            cursor.execute("SET LOCAL synchronous_commit = off")
+            result_ids = [str(uuid.uuid4()) for _ in results]
+            rows = [
+                (result_id, conversation_id, tool_name, command, stdout,
+                 Json(parsed_data) if parsed_data else None)
+                for result_id, (tool_name, command, stdout, parsed_data) in zip(result_ids, results)
+            ]
             
-            cursor.execute("""
-                INSERT INTO tool_results (id, conversation_id, tool_name, command, stdout, parsed_data)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (result_id, conversation_id, tool_name, command, stdout, parsed_json))
+            # Large outputs are streamed with COPY instead of being inlined as SQL literals
+            large = [row for row in rows if row[4] and len(row[4]) > self.COPY_STDOUT_THRESHOLD]
+            small = [row for row in rows if not (row[4] and len(row[4]) > self.COPY_STDOUT_THRESHOLD)]
+            if small:
+                execute_values(cursor, """
+                    INSERT INTO tool_results (id, conversation_id, tool_name, command, stdout, parsed_data)
+                    VALUES %s
+                """, small, page_size=500)
+            if large:
+                buf = StringIO()
+                for row in large:
+                    buf.write("\t".join(_copy_field(value) for value in row))
+                    buf.write("\n")
+                buf.seek(0)
+                cursor.copy_expert(
+                    "COPY tool_results (id, conversation_id, tool_name, command, stdout, parsed_data) "
+                    "FROM STDIN WITH (FORMAT text)",
+                    buf
+                )
             
             conn.commit()
             cursor.close()
-            return result_id
-        except Exception as e:
+            return result_ids
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to add tool result: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
 
     def add_finding(self, 
                     conversation_id: str, 
@@ -634,7 +1349,7 @@ class ConversationStore:
                     source_tool: str, 
                     confidence: float = 1.0, 
                     metadata: Optional[Dict] = None,
-                    target: Optional[str] = None) -> str:
+                    target: Optional[str] = None) -> Optional[str]:
         """Add a finding.
         
         Args:
@@ -646,27 +1361,58 @@ class ConversationStore:
             metadata: Additional info
             
         Returns:
-            Finding UUID
+            Finding UUID, or None if the finding was already recorded
+        """
+        inserted = self.add_findings_bulk(
+            conversation_id, [(finding_type, value, source_tool, confidence, metadata, target)]
+        )
+        return inserted[0] if inserted else None
+
+    @retry_on_deadlock()
+    def add_findings_bulk(self,
+                          conversation_id: str,
+                          findings: List[Tuple[str, str, str, float, Optional[Dict], Optional[str]]]) -> List[str]:
+        """Add several findings in one INSERT.
+        
+        Findings already recorded for the same (type, value, target) are
+        skipped via ON CONFLICT DO NOTHING.
+        
+        Args:
+            conversation_id: Conversation UUID
+            findings: (finding_type, value, source_tool, confidence, metadata, target) tuples
+            
+        Returns:
+            UUIDs of the findings actually inserted
         """
+        if not findings:
+            return []
+        
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
-            finding_id = str(uuid.uuid4())
-            metadata_json = json.dumps(metadata) if metadata else None
+            # Findings are re-derivable from tool runs: don't wait for the WAL fsync on commit
+            cursor.execute("SET LOCAL synchronous_commit = off")
+            rows = [
+                (str(uuid.uuid4()), conversation_id, finding_type, value, source_tool, confidence,
+                 Json(metadata) if metadata else None, target)
+                for finding_type, value, source_tool, confidence, metadata, target in findings
+            ]
             
-            cursor.execute("""
+            inserted = execute_values(cursor, f"""
                 INSERT INTO findings (id, conversation_id, type, value, source_tool, confidence, metadata, target)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (finding_id, conversation_id, finding_type, value, source_tool, confidence, metadata_json, target))
+                VALUES %s
+                ON CONFLICT {self.FINDINGS_CONFLICT_TARGET} DO NOTHING
+                RETURNING id
+            """, rows, page_size=500, fetch=True)
             
             conn.commit()
             cursor.close()
-            return finding_id
-        except Exception as e:
+            return [str(row[0]) for row in inserted]
+        except Exception:
             conn.rollback()
-            raise Exception(f"Failed to add finding: {e}")
+            raise
         finally:
-            conn.close()
+            self._put_connection(conn)
 
     def get_findings(self, conversation_id: str, finding_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get findings for a conversation.
@@ -697,10 +1443,47 @@ class ConversationStore:
             cursor.close()
             
             return [dict(row) for row in rows]
-        except Exception as e:
-            raise Exception(f"Failed to get findings: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
+
+    def search_findings(self,
+                        conversation_id: str,
+                        value_pattern: str,
+                        finding_type: Optional[str] = None,
+                        limit: int = 100) -> List[Dict[str, Any]]:
+        """Search a conversation's findings by value (case-insensitive).
+        
+        Args:
+            conversation_id: Conversation UUID
+            value_pattern: ILIKE pattern, e.g. '%10.0.0.%'
+            finding_type: Optional type filter
+            limit: Maximum number of findings to return
+            
+        Returns:
+            List of matching findings, newest first
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            query = "SELECT * FROM findings WHERE conversation_id = %s AND value ILIKE %s"
+            params: List[Any] = [conversation_id, value_pattern]
+            
+            if finding_type:
+                query += " AND type = %s"
+                params.append(finding_type)
+            
+            query += " ORDER BY created_at DESC LIMIT %s"
+            params.append(limit)
+            
+            cursor.execute(query, tuple(params))
+            
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return [dict(row) for row in rows]
+        finally:
+            self._put_connection(conn)
 
     def get_tool_results(self, conversation_id: str) -> List[Dict[str, Any]]:
         """Get tool results for a conversation.
@@ -725,7 +1508,5 @@ class ConversationStore:
             cursor.close()
             
             return [dict(row) for row in rows]
-        except Exception as e:
-            raise Exception(f"Failed to get tool results: {e}")
         finally:
-            conn.close()
+            self._put_connection(conn)
@@ -11,6 +11,7 @@ Production Architecture:
 """
 
 import uuid
+import threading
 import warnings
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -18,6 +19,8 @@ from collections import defaultdict
 
 from memory.session import SessionMemory, AgentContext
 from memory.conversation_store import ConversationStore
+from memory.conversation_journal import ConversationJournal
+from memory.async_writer import AsyncWriter
 from memory.summary_compressor import SummaryCompressor
 from memory.namespace_manager import NamespaceManager
 from memory.namespace_manager import NamespaceManager
@@ -61,6 +64,12 @@ class MemoryManager:
         
         # Production: Persistent storage
         self.conversation_store = ConversationStore()
+        self.conversation_journal = ConversationJournal()
+        # Journal entry id of the turn in progress, per conversation
+        self._turn_journal_ids: Dict[str, str] = {}
+        # Last snapshot turn id per conversation (seeded from the stored message count)
+        self._turn_counters: Dict[str, int] = {}
+        self.message_writer = AsyncWriter(self.conversation_store)
         self.summary_compressor = SummaryCompressor()
         self.namespace_manager = NamespaceManager()
         
@@ -72,7 +81,8 @@ class MemoryManager:
         self.session_processor = SessionProcessor(
             redis_buffer=self.redis_buffer,
             conversation_store=self.conversation_store,
-            vector_store=self.conversation_retriever.vectorstore
+            vector_store=self.conversation_retriever.vectorstore,
+            message_writer=self.message_writer
         )
         
         # New Context Manager (Turn Snapshots)
@@ -119,22 +129,13 @@ class MemoryManager:
         # Update conversation with session_id for migration
         try:
             # Store session_id in conversation metadata for migration
-            import psycopg2
-            import os
-            conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", "localhost"),
-                port=int(os.getenv("POSTGRES_PORT", "5432")),
-                database=os.getenv("POSTGRES_DATABASE", "firestarter_pg"),
-                user=os.getenv("POSTGRES_USER", "firestarter_ad"),
-                password=os.getenv("POSTGRES_PASSWORD", "")
-            )
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE conversations SET session_id = %s WHERE id = %s
-            """, (self.session_id, self.conversation_id))
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with self.conversation_store._conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE conversations SET session_id = %s WHERE id = %s
+                """, (self.session_id, self.conversation_id))
+                conn.commit()
+                cursor.close()
         except Exception:
             pass  # Non-critical
         
@@ -182,6 +183,12 @@ class MemoryManager:
         Args:
             conversation_id: Conversation UUID to switch to
         """
+        # Recover messages journaled by turns that never reached the store
+        try:
+            self.compact_journal(conversation_id)
+        except Exception as e:
+            print(f"Journal replay error: {e}")
+        
         # Load conversation context
         context = self.namespace_manager.load_conversation_context(conversation_id)
         
@@ -286,6 +293,10 @@ class MemoryManager:
         session = session_id or self.session_id or self.get_or_create_session()
         domain = context.get("target_domain") if context else self.target_domain
         
+        # Number this turn before its messages are queued: the stored count lags
+        # behind the background writer, so later turns count in memory
+        turn_id = self._next_turn_id(conv_id)
+        
         # Save to all memory layers via SessionProcessor (Structured Breakdown)
         try:
             self.session_processor.process_and_save(
@@ -297,8 +308,10 @@ class MemoryManager:
         except Exception as e:
             print(f"SessionProcessor error: {e}")
             # Fallback to legacy save
-            self.conversation_store.add_message(conv_id, "user", user_message)
-            self.conversation_store.add_message(conv_id, "assistant", assistant_message)
+            self.conversation_store.add_messages(conv_id, [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": assistant_message}
+            ])
 
         # Update session memory (Agent Context)
         if self.session_memory:
@@ -329,9 +342,6 @@ class MemoryManager:
 
         # 4. Create Immutable Snapshot (ContextManager)
         try:
-             # Calculate turn ID (using message count / 2 roughly, or get strict count)
-             turn_id = self.conversation_store.get_message_count(conv_id) // 2
-             
              # Create snapshot
              self.context_manager.create_snapshot(
                  session_id=conv_id, # Using conversation_id as session_id for consistency in v2
@@ -339,7 +349,9 @@ class MemoryManager:
                  user_input=user_message,
                  model_response=assistant_message,
                  tool_outputs=[], # TODO: Pass actual tool outputs if available in save_turn signature
-                 agent_plan=None
+                 agent_plan=None,
+                 # Saved as the verified target above, so no need to read it back
+                 verified_target=domain if self.session_memory and domain and "." in domain else None
              )
         except Exception as e:
             print(f"Snapshot creation error: {e}")
@@ -353,6 +365,120 @@ class MemoryManager:
         except Exception as e:
             print(f"Summarization error: {e}")
     
+    def _next_turn_id(self, conversation_id: str) -> int:
+        """
+        Allocate the next snapshot turn id for a conversation.
+        
+        The first turn in this process continues from the stored message count
+        (two messages per turn); later turns increment an in-memory counter.
+        
+        Args:
+            conversation_id: Conversation identifier
+            
+        Returns:
+            Turn id (1-based)
+        """
+        last = self._turn_counters.get(conversation_id)
+        if last is None:
+            try:
+                last = self.conversation_store.get_message_count(conversation_id) // 2
+            except Exception:
+                last = 0
+        self._turn_counters[conversation_id] = last + 1
+        return last + 1
+    
+    def persist_turn(
+        self,
+        user_message: str,
+        assistant_message: str,
+        tools_used: List[str] = None,
+        session_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        context: Dict = None
+    ):
+        """
+        Persist a completed turn with a single call.
+        
+        save_turn queues both messages of the turn on the background message
+        writer, which stores them in a batch with other pending messages, so
+        callers must not add the assistant message separately. The journaled
+        prompt is marked committed only after that write succeeds; if it fails
+        the entry stays pending and is replayed when the conversation is next
+        loaded. If queueing the turn fails it is kept in the legacy in-memory
+        buffer instead.
+        
+        Args:
+            user_message: User message
+            assistant_message: Assistant response
+            tools_used: List of tools used
+            session_id: Session identifier (legacy, uses current if None)
+            conversation_id: Conversation identifier (preferred)
+            context: Additional context
+        """
+        try:
+            self.save_turn(
+                user_message=user_message,
+                assistant_message=assistant_message,
+                tools_used=tools_used,
+                session_id=session_id,
+                conversation_id=conversation_id,
+                context=context
+            )
+            # Commit the journaled prompt once the background writer has stored the
+            # turn; if that write fails the entry stays pending for replay
+            conv_id = conversation_id or self.conversation_id
+            entry_id = self._turn_journal_ids.pop(conv_id, None) if conv_id else None
+            if entry_id:
+                self.message_writer.when_written(
+                    conv_id, lambda: self.conversation_journal.mark_persisted(conv_id, [entry_id])
+                )
+        except Exception as e:
+            print(f"Failed to persist turn, keeping it in memory: {e}")
+            session = session_id or self.get_or_create_session()
+            self._conversation_buffers.setdefault(session, []).extend([
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": assistant_message}
+            ])
+    
+    def journal_message(self, conversation_id: str, role: str, content: str):
+        """
+        Journal the message that starts a turn, ahead of the turn being persisted.
+        
+        Cheaper than a database insert; the message reaches PostgreSQL through
+        persist_turn, or through compact_journal (run when the conversation is
+        next loaded) if the turn never completes.
+        
+        Args:
+            conversation_id: Conversation identifier
+            role: Message role
+            content: Message content
+        """
+        # An earlier turn that never completed keeps its entry uncommitted for replay
+        self._turn_journal_ids[conversation_id] = self.conversation_journal.append(conversation_id, role, content)
+    
+    def flush_writes(self):
+        """
+        Wait for queued background message and snapshot writes to reach PostgreSQL.
+        """
+        self.message_writer.flush()
+        self.context_manager.flush()
+    
+    def compact_journal(self, conversation_id: Optional[str] = None) -> int:
+        """
+        Replay unpersisted journal entries into PostgreSQL and truncate the journal.
+        
+        Args:
+            conversation_id: Conversation identifier (uses current if None)
+            
+        Returns:
+            Number of messages replayed
+        """
+        conv_id = conversation_id or self.conversation_id
+        if not conv_id:
+            return 0
+        self.flush_writes()
+        return self.conversation_journal.compact(conv_id, self.conversation_store)
+    
     # ==================== Context Retrieval ====================
     
     def retrieve_context(
@@ -506,6 +632,7 @@ class MemoryManager:
         # PERSISTENCE: Save individual findings to structured SQL table
         # This allows Q&A agent and Analysis node to query them easily
         if conv_id:
+            rows = []
             for target in persistence_targets:
                 for ftype in ["subdomains", "ips", "open_ports", "vulnerabilities", "technologies", "emails", "urls"]:
                     if ftype in updates and updates[ftype]:
@@ -514,16 +641,14 @@ class MemoryManager:
                             items = [items]
                         
                         for item in items:
-                            try:
-                                self.conversation_store.add_finding(
-                                    conversation_id=conv_id,
-                                    finding_type=ftype,
-                                    value=str(item),
-                                    source_tool=source_tool,
-                                    target=target
-                                )
-                            except Exception as e:
-                                print(f"Error persisting finding {ftype} for {target}: {e}")
+                            rows.append((ftype, str(item), source_tool, 1.0, None, target))
+            
+            # One INSERT for the whole update instead of one round trip per item
+            if rows:
+                try:
+                    self.conversation_store.add_findings_bulk(conv_id, rows)
+                except Exception as e:
+                    print(f"Error persisting {len(rows)} finding(s): {e}")
 
         # 🆕 PERSISTENCE FIX: Persist agent context (JSON blob) after every update
         self._persist_agent_context()
@@ -565,9 +690,11 @@ class MemoryManager:
         # Try PostgreSQL (persistent storage)
         if conv_id:
             try:
-                messages = self.conversation_store.get_messages(conv_id)
-                # Convert to legacy format
-                return [{"role": msg.get("role"), "content": msg.get("content")} for msg in messages]
+                # Convert to legacy format while streaming, without materializing full rows
+                return [
+                    {"role": msg.get("role"), "content": msg.get("content")}
+                    for msg in self.conversation_store.iter_messages(conv_id)
+                ]
             except Exception:
                 pass
         
@@ -805,11 +932,18 @@ class MemoryManager:
 
 # Singleton instance
 _memory_manager: Optional[MemoryManager] = None
+_memory_manager_lock = threading.Lock()
 
 
 def get_memory_manager() -> MemoryManager:
-    """Get singleton memory manager instance."""
+    """Get singleton memory manager instance.
+    
+    The fast path is a single global read; the lock only guards first
+    construction, which startup runs on a worker thread.
+    """
     global _memory_manager
     if _memory_manager is None:
-        _memory_manager = MemoryManager()
+        with _memory_manager_lock:
+            if _memory_manager is None:
+                _memory_manager = MemoryManager()
     return _memory_manager
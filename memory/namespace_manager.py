@@ -51,13 +51,12 @@ class NamespaceManager:
             - active_entities: active entities (domains, IPs)
             - open_tasks: open tasks (subtasks not completed)
         """
-        # Get conversation metadata
-        conversation = self.conversation_store.get_conversation(conversation_id)
-        if not conversation:
+        # Get conversation metadata and recent messages (last 20 for context) in one query
+        bundle = self.conversation_store.get_conversation_bundle(conversation_id, k=20)
+        if not bundle:
             return {}
-        
-        # Get recent messages (last 20 for context)
-        recent_messages = self.conversation_store.get_recent_messages(conversation_id, k=20)
+        conversation = bundle["conversation"]
+        recent_messages = bundle["recent_messages"]
         
         # Get verified target
         verified_target = conversation.get('verified_target')
@@ -115,36 +114,21 @@ class NamespaceManager:
         Returns:
             Agent state dict or None
         """
-        import os
-        import psycopg2
         from psycopg2.extras import RealDictCursor
         
-        postgres_host = os.getenv("POSTGRES_HOST", "localhost")
-        postgres_port = int(os.getenv("POSTGRES_PORT", "5432"))
-        postgres_database = os.getenv("POSTGRES_DATABASE", "firestarter_pg")
-        postgres_user = os.getenv("POSTGRES_USER", "firestarter_ad")
-        postgres_password = os.getenv("POSTGRES_PASSWORD", "")
-        
         try:
-            conn = psycopg2.connect(
-                host=postgres_host,
-                port=postgres_port,
-                database=postgres_database,
-                user=postgres_user,
-                password=postgres_password
-            )
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Load all state types for this conversation
-            cursor.execute("""
-                SELECT state_type, state_data
-                FROM agent_states
-                WHERE conversation_id = %s
-            """, (conversation_id,))
-            
-            rows = cursor.fetchall()
-            cursor.close()
-            conn.close()
+            with self.conversation_store._conn() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                
+                # Load all state types for this conversation
+                cursor.execute("""
+                    SELECT state_type, state_data
+                    FROM agent_states
+                    WHERE conversation_id = %s
+                """, (conversation_id,))
+                
+                rows = cursor.fetchall()
+                cursor.close()
             
             if rows:
                 # Combine all state types into one dict
@@ -172,38 +156,21 @@ class NamespaceManager:
             state_type: Type of state ('session_memory', 'agent_context', etc.)
             state_data: State data dict
         """
-        import os
-        import psycopg2
-        
-        postgres_host = os.getenv("POSTGRES_HOST", "localhost")
-        postgres_port = int(os.getenv("POSTGRES_PORT", "5432"))
-        postgres_database = os.getenv("POSTGRES_DATABASE", "firestarter_pg")
-        postgres_user = os.getenv("POSTGRES_USER", "firestarter_ad")
-        postgres_password = os.getenv("POSTGRES_PASSWORD", "")
-        
-        try:
-            conn = psycopg2.connect(
-                host=postgres_host,
-                port=postgres_port,
-                database=postgres_database,
-                user=postgres_user,
-                password=postgres_password
-            )
-            cursor = conn.cursor()
-            
-            # Use UPSERT (INSERT ... ON CONFLICT UPDATE)
-            state_json = json.dumps(state_data)
-            cursor.execute("""
-                INSERT INTO agent_states (conversation_id, state_type, state_data, updated_at)
-                VALUES (%s, %s, %s, NOW())
-                ON CONFLICT (conversation_id, state_type)
-                DO UPDATE SET state_data = EXCLUDED.state_data, updated_at = NOW()
-            """, (conversation_id, state_type, state_json))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-        except Exception as e:
-            conn.rollback()
-            conn.close()
-            raise Exception(f"Failed to save agent state: {e}")
+        with self.conversation_store._conn() as conn:
+            try:
+                cursor = conn.cursor()
+                
+                # Use UPSERT (INSERT ... ON CONFLICT UPDATE)
+                state_json = json.dumps(state_data)
+                cursor.execute("""
+                    INSERT INTO agent_states (conversation_id, state_type, state_data, updated_at)
+                    VALUES (%s, %s, %s, NOW())
+                    ON CONFLICT (conversation_id, state_type)
+                    DO UPDATE SET state_data = EXCLUDED.state_data, updated_at = NOW()
+                """, (conversation_id, state_type, state_json))
+                
+                conn.commit()
+                cursor.close()
+            except Exception as e:
+                conn.rollback()
+                raise Exception(f"Failed to save agent state: {e}")
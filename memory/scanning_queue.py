@@ -1,10 +1,11 @@
 """Durable Scanning Queue (DSQ) Manager using PostgreSQL."""
 
-import json
+from memory._json import dumps, loads
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
 import logging
+from psycopg2.extras import execute_values
 
 class ScanningQueue:
     """Manager for persistent scanning tasks in PostgreSQL."""
@@ -34,28 +35,30 @@ class ScanningQueue:
             parameters: Base parameters for the tool
             
         Returns:
-            Number of targets added
+            Number of targets added (targets already pending or scanning are skipped)
         """
+        if not targets:
+            return 0
+        
         conn = self.store._get_connection()
         try:
             cursor = conn.cursor()
-            query = """
+            # Parameters are the same for every target: serialize once
+            params_json = dumps(parameters or {})
+            rows = [
+                (conversation_id, target, tool_name, command_name, params_json)
+                for target in targets
+            ]
+            
+            # One multi-row INSERT per page instead of a round trip per target
+            inserted = execute_values(cursor, """
                 INSERT INTO scan_tasks 
                 (conversation_id, host, tool_name, command_name, parameters, status)
-                VALUES (%s, %s, %s, %s, %s, 'pending')
+                VALUES %s
                 ON CONFLICT DO NOTHING
-            """
-            
-            count = 0
-            for target in targets:
-                cursor.execute(query, (
-                    conversation_id, 
-                    target, 
-                    tool_name, 
-                    command_name, 
-                    json.dumps(parameters or {}),
-                ))
-                count += 1
+                RETURNING 1
+            """, rows, template="(%s, %s, %s, %s, %s, 'pending')", page_size=1000, fetch=True)
+            count = len(inserted)
                 
             conn.commit()
             cursor.close()
@@ -65,7 +68,7 @@ class ScanningQueue:
             self.logger.error(f"Failed to add targets to queue: {e}")
             return 0
         finally:
-            conn.close()
+            self.store._put_connection(conn)
 
     def claim_task(self, conversation_id: str) -> Optional[Dict[str, Any]]:
         """Atomically claim a pending task for scanning.
@@ -78,17 +81,53 @@ class ScanningQueue:
         Returns:
             Task details or None if no tasks available
         """
+        return (self.claim_tasks(conversation_id, 1) or [None])[0]
+
+    def claim_tasks(self, conversation_id: str, batch: int = 16) -> List[Dict[str, Any]]:
+        """Atomically claim up to batch pending tasks in one round trip.
+        
+        Claimed tasks stay in 'scanning' until update_result, so batches suit a
+        single consumer; concurrent workers should claim one task at a time.
+        
+        Args:
+            conversation_id: Conversation ID
+            batch: Maximum number of tasks to claim
+            
+        Returns:
+            Task details in priority order (empty if no tasks available)
+        """
+        return self._claim("AND conversation_id = %s", (conversation_id,), batch)
+
+    def claim_next_task(self) -> Optional[Dict[str, Any]]:
+        """Atomically claim the highest-priority pending task of any conversation.
+        
+        Returns:
+            Task details (including conversation_id) or None if the queue is empty
+        """
+        return (self._claim("", (), 1) or [None])[0]
+
+    def _claim(self, condition: str, params: tuple, limit: int) -> List[Dict[str, Any]]:
+        """Lock pending tasks matching condition and mark them as scanning.
+        
+        Args:
+            condition: Extra SQL appended to the pending-task WHERE clause
+            params: Parameters for condition
+            limit: Maximum number of tasks to claim
+            
+        Returns:
+            Task details in priority order (empty if no tasks available)
+        """
         conn = self.store._get_connection()
         try:
             cursor = conn.cursor()
             
-            # Select and lock one pending task
-            select_query = """
+            # Select and lock pending tasks (served by idx_scan_tasks_pending)
+            select_query = f"""
                 WITH cte AS (
-                  SELECT id FROM scan_tasks
-                  WHERE conversation_id = %s AND status = 'pending'
+                  SELECT id, priority, created_at FROM scan_tasks
+                  WHERE status = 'pending' {condition}
                   ORDER BY priority DESC, created_at ASC
-                  LIMIT 1
+                  LIMIT %s
                   FOR UPDATE SKIP LOCKED
                 )
                 UPDATE scan_tasks
@@ -96,32 +135,35 @@ class ScanningQueue:
                 FROM cte
                 WHERE scan_tasks.id = cte.id
                 RETURNING scan_tasks.id, scan_tasks.host, scan_tasks.tool_name, 
-                          scan_tasks.command_name, scan_tasks.parameters
+                          scan_tasks.command_name, scan_tasks.parameters,
+                          scan_tasks.conversation_id, cte.priority, cte.created_at
             """
             
-            cursor.execute(select_query, (conversation_id,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return None
-                
-            task = {
-                "id": str(row[0]),
-                "host": row[1],
-                "tool_name": row[2],
-                "command_name": row[3],
-                "parameters": row[4] if isinstance(row[4], dict) else json.loads(row[4] or '{}')
-            }
+            cursor.execute(select_query, params + (limit,))
+            # UPDATE ... RETURNING has no defined order; restore the dequeue order
+            rows = sorted(cursor.fetchall(), key=lambda r: (-(r[6] or 0), r[7]))
+            
+            tasks = [
+                {
+                    "id": str(row[0]),
+                    "host": row[1],
+                    "tool_name": row[2],
+                    "command_name": row[3],
+                    "parameters": row[4] if isinstance(row[4], dict) else loads(row[4] or '{}'),
+                    "conversation_id": str(row[5])
+                }
+                for row in rows
+            ]
             
             conn.commit()
             cursor.close()
-            return task
+            return tasks
         except Exception as e:
             conn.rollback()
             self.logger.error(f"Failed to claim task: {e}")
-            return None
+            return []
         finally:
-            conn.close()
+            self.store._put_connection(conn)
 
     def update_result(self, task_id: str, success: bool, result: Any = None, error: str = None):
         """Update task status and store result.
@@ -137,71 +179,38 @@ class ScanningQueue:
             cursor = conn.cursor()
             status = 'done' if success else 'error'
             
-            query = """
-                UPDATE scan_tasks
-                SET status = %s, result = %s, error = %s, updated_at = NOW()
-                WHERE id = %s
+            # Store the result and, on success, promote findings in the same statement.
+            # Extraction rules: each open_ports entry with a port becomes a 'port'
+            # finding (value = port, target = task host, metadata = service + host,
+            # service defaulting to 'unknown'), attributed to the task's tool.
+            query = f"""
+                WITH updated AS (
+                    UPDATE scan_tasks
+                    SET status = %s, result = %s::jsonb, error = %s, updated_at = NOW()
+                    WHERE id = %s
+                    RETURNING conversation_id, host, tool_name, result
+                )
+                INSERT INTO findings (conversation_id, type, value, source_tool, target, metadata)
+                SELECT u.conversation_id, 'port', p->>'port', u.tool_name, u.host,
+                       jsonb_build_object('service', COALESCE(p->>'service', 'unknown'), 'host', u.host)
+                FROM updated u,
+                     jsonb_array_elements(
+                         CASE WHEN jsonb_typeof(u.result->'open_ports') = 'array'
+                              THEN u.result->'open_ports' ELSE '[]'::jsonb END
+                     ) AS p
+                WHERE %s AND p->>'port' IS NOT NULL
+                ON CONFLICT {self.store.FINDINGS_CONFLICT_TARGET} DO NOTHING
             """
-            cursor.execute(query, (status, json.dumps(result or {}), error, task_id))
+            cursor.execute(query, (status, dumps(result or {}), error, task_id, bool(success and result)))
             
             conn.commit()
             cursor.close()
-            
-            # If successful, promote results to findings table
-            if success and result:
-                self.promote_findings(task_id)
                 
         except Exception as e:
             conn.rollback()
             self.logger.error(f"Failed to update task result: {e}")
         finally:
-            conn.close()
-
-    def promote_findings(self, task_id: str):
-        """Extract important findings from scan result and promote to conversation findings table."""
-        conn = self.store._get_connection()
-        try:
-            cursor = conn.cursor()
-            
-            # Get task details
-            cursor.execute("SELECT conversation_id, host, tool_name, result FROM scan_tasks WHERE id = %s", (task_id,))
-            row = cursor.fetchone()
-            if not row: return
-            
-            conv_id, host, tool, result_data = row
-            if isinstance(result_data, str): result_data = json.loads(result_data)
-            
-            # Logic to extract findings based on tool type
-            # Example for nmap: promote open ports
-            findings = []
-            
-            if 'open_ports' in result_data:
-                for port_info in result_data['open_ports']:
-                    port = port_info.get('port')
-                    service = port_info.get('service', 'unknown')
-                    findings.append({
-                        'type': 'port',
-                        'value': str(port),
-                        'metadata': {'service': service, 'host': host}
-                    })
-            
-            # Insert findings
-            insert_query = """
-                INSERT INTO findings (conversation_id, type, value, source_tool, target, metadata)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            for f in findings:
-                cursor.execute(insert_query, (
-                    conv_id, f['type'], f['value'], tool, host, json.dumps(f['metadata'])
-                ))
-            
-            conn.commit()
-            cursor.close()
-        except Exception as e:
-            conn.rollback()
-            self.logger.error(f"Failed to promote findings: {e}")
-        finally:
-            conn.close()
+            self.store._put_connection(conn)
 
     def get_progress(self, conversation_id: str) -> Dict[str, Any]:
         """Get scan progress summary for a conversation.
@@ -215,16 +224,18 @@ class ScanningQueue:
         conn = self.store._get_connection()
         try:
             cursor = conn.cursor()
+            # Status counts aggregated server-side into one jsonb object
             query = """
-                SELECT status, COUNT(*) 
-                FROM scan_tasks 
-                WHERE conversation_id = %s 
-                GROUP BY status
+                SELECT COALESCE(jsonb_object_agg(status, cnt), '{}'::jsonb)
+                FROM (
+                    SELECT status, COUNT(*) AS cnt
+                    FROM scan_tasks 
+                    WHERE conversation_id = %s 
+                    GROUP BY status
+                ) s
             """
             cursor.execute(query, (conversation_id,))
-            rows = cursor.fetchall()
-            
-            stats = {row[0]: row[1] for row in rows}
+            stats = cursor.fetchone()[0]
             total = sum(stats.values())
             done = stats.get('done', 0) + stats.get('error', 0)
             
@@ -240,4 +251,4 @@ class ScanningQueue:
         except Exception:
             return {"total": 0, "percent_complete": 0}
         finally:
-            conn.close()
+            self.store._put_connection(conn)
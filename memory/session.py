@@ -8,15 +8,22 @@ This module provides VOLATILE memory for the current session:
 This is DIFFERENT from Conversation History (persistent storage) which is PERSISTENT.
 """
 
-from dataclasses import dataclass, field
+from collections import defaultdict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple
 from uuid import uuid4
 import json
 import re
+import time
+from ipaddress import ip_address
 from urllib.parse import urlparse
 
 
+_DOMAIN_RE = re.compile(r'^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$')
+_HIGH_VALUE_RE = re.compile(r'admin|api|login|auth|dashboard|manage|portal', re.IGNORECASE)
+
+
 @dataclass
 class AgentContext:
     """
@@ -76,21 +83,57 @@ class AgentContext:
     # Authorized scope (for policy enforcement)
     authorized_scope: List[str] = field(default_factory=list)  
     
+    # Set sidecars for O(1) dedup of the list fields above: name -> (list, set).
+    # Rebuilt whenever the list is replaced or changed from outside.
+    _seen: Dict[str, Tuple[List[Any], Set[Any]]] = field(default_factory=dict, repr=False, compare=False)
+    
+    # Epoch time of the last unformatted _touch; last_updated is refreshed from it on read
+    _touched_at: Optional[float] = field(default=None, repr=False, compare=False)
+    
+    # open_ports entry fields; an entry is a duplicate only if all of them match
+    _PORT_FIELDS = ("host", "ip", "port", "protocol", "service", "version", "fingerprint")
+    
+    def _seen_set(self, name: str, key=None) -> Set[Any]:
+        """Get the membership set mirroring list field name (items mapped through key)."""
+        values = getattr(self, name)
+        entry = self._seen.get(name)
+        if entry is None or entry[0] is not values or len(entry[1]) != len(values):
+            entry = (values, set(values) if key is None else {key(v) for v in values})
+            self._seen[name] = entry
+        return entry[1]
+    
+    @classmethod
+    def _port_key(cls, entry: Dict[str, Any]) -> Tuple:
+        """Hashable identity of an open_ports entry."""
+        return tuple(entry.get(f) for f in cls._PORT_FIELDS)
+    
+    def _add_unique(self, name: str, value: str) -> bool:
+        """Append value to list field name unless present. Returns True if added."""
+        if not value:
+            return False
+        seen = self._seen_set(name)
+        if value in seen:
+            return False
+        seen.add(value)
+        getattr(self, name).append(value)
+        return True
+    
     def add_subdomain(self, subdomain: str):
         """Add a subdomain if not already present."""
-        if subdomain and subdomain not in self.subdomains:
-            self.subdomains.append(subdomain)
+        if self._add_unique("subdomains", subdomain):
             self._touch()
     
     def add_subdomains(self, subdomains: List[str]):
         """Add multiple subdomains."""
+        added = False
         for s in subdomains:
-            self.add_subdomain(s)
+            added = self._add_unique("subdomains", s) or added
+        if added:
+            self._touch()
     
     def add_ip(self, ip: str):
         """Add an IP if not already present."""
-        if ip and ip not in self.ips:
-            self.ips.append(ip)
+        if self._add_unique("ips", ip):
             self._touch()
     
     def add_port(self, host: str, port: int, protocol: str = "tcp", service: str = "", ip: str = "", version: str = "", fingerprint: str = ""):
@@ -104,9 +147,13 @@ class AgentContext:
             "version": version,
             "fingerprint": fingerprint
         }
-        if entry not in self.open_ports:
-            self.open_ports.append(entry)
-            self._touch()
+        seen = self._seen_set("open_ports", key=self._port_key)
+        port_key = self._port_key(entry)
+        if port_key in seen:
+            return
+        seen.add(port_key)
+        self.open_ports.append(entry)
+        self._touch()
     
     def add_vulnerability(self, vuln_type: str, target: str, severity: str = "medium", 
                          cve: str = "", details: Dict = None):
@@ -119,32 +166,30 @@ class AgentContext:
             "details": details or {}
         }
         self.vulnerabilities.append(entry)
-        if cve and cve not in self.cves:
-            self.cves.append(cve)
+        self._add_unique("cves", cve)
         self._touch()
     
     def add_technology(self, tech: str):
         """Add detected technology."""
-        if tech and tech not in self.technologies:
-            self.technologies.append(tech)
+        if self._add_unique("technologies", tech):
             self._touch()
     
     def add_tool_run(self, tool: str):
         """Record that a tool was run."""
-        if tool and tool not in self.tools_run:
-            self.tools_run.append(tool)
+        if self._add_unique("tools_run", tool):
             self._touch()
     
     def add_active_entity(self, entity: str):
         """Add an active entity (domain, IP) being worked on."""
-        if entity and entity not in self.active_entities:
-            self.active_entities.append(entity)
+        if self._add_unique("active_entities", entity):
             self._touch()
     
     def remove_active_entity(self, entity: str):
         """Remove an active entity."""
-        if entity in self.active_entities:
+        seen = self._seen_set("active_entities")
+        if entity in seen:
             self.active_entities.remove(entity)
+            seen.discard(entity)
             self._touch()
     
     def add_open_task(self, task: Dict[str, Any]):
@@ -162,18 +207,27 @@ class AgentContext:
     
     def add_topic(self, topic: str):
         """Add a conversation topic."""
-        if topic and topic not in self.topics:
-            self.topics.append(topic)
+        if self._add_unique("topics", topic):
             self._touch()
     
     def add_topics(self, topics: List[str]):
         """Add multiple topics."""
+        added = False
         for topic in topics:
-            self.add_topic(topic)
+            added = self._add_unique("topics", topic) or added
+        if added:
+            self._touch()
     
     def _touch(self):
-        """Update last_updated timestamp."""
-        self.last_updated = datetime.now().isoformat()
+        """Record a modification; last_updated is formatted lazily by _sync_last_updated."""
+        self._touched_at = time.time()
+    
+    def _sync_last_updated(self) -> str:
+        """Format the pending _touch time into last_updated and return it."""
+        if self._touched_at is not None:
+            self.last_updated = datetime.fromtimestamp(self._touched_at).isoformat()
+            self._touched_at = None
+        return self.last_updated
     
     def get_targets_for_scanning(self) -> List[str]:
         """Get all targets (domain + subdomains + IPs) for scanning."""
@@ -186,42 +240,15 @@ class AgentContext:
     
     def get_high_value_targets(self) -> List[str]:
         """Get high-value targets (admin panels, APIs, etc.)."""
-        high_value = []
-        keywords = ["admin", "api", "login", "auth", "dashboard", "manage", "portal"]
-        
-        for sub in self.subdomains:
-            if any(kw in sub.lower() for kw in keywords):
-                high_value.append(sub)
-        
-        for endpoint in self.endpoints:
-            if any(kw in endpoint.lower() for kw in keywords):
-                high_value.append(endpoint)
-        
+        search = _HIGH_VALUE_RE.search
+        high_value = [sub for sub in self.subdomains if search(sub)]
+        high_value.extend(endpoint for endpoint in self.endpoints if search(endpoint))
         return high_value
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return {
-            "domain": self.domain,
-            "targets": self.targets,
-            "legal_name": self.legal_name,
-            "target_country": self.target_country,
-            "target_asn": self.target_asn,
-            "target_ip_ranges": self.target_ip_ranges,
-            "subdomains": self.subdomains,
-            "ips": self.ips,
-            "technologies": self.technologies,
-            "open_ports": self.open_ports,
-            "services": self.services,
-            "vulnerabilities": self.vulnerabilities,
-            "cves": self.cves,
-            "tools_run": self.tools_run,
-            "last_updated": self.last_updated,
-            "active_entities": self.active_entities,
-            "open_tasks": self.open_tasks,
-            "topics": self.topics,
-            "authorized_scope": self.authorized_scope,
-        }
+        """Convert to dictionary for serialization (all public fields)."""
+        self._sync_last_updated()
+        return {name: getattr(self, name) for name in _AGENT_CONTEXT_FIELDS}
     
     def get_summary(self) -> str:
         """Get a brief summary of findings."""
@@ -269,15 +296,21 @@ class AgentContext:
         """Check if string looks like a valid domain."""
         if not domain:
             return False
-        pattern = r'^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, domain))
+        return bool(_DOMAIN_RE.match(domain))
     
     def _is_valid_ip(self, ip: str) -> bool:
-        """Check if string looks like a valid IP."""
+        """Check if string is a valid IPv4 or IPv6 address."""
         if not ip:
             return False
-        pattern = r'^(?:\d{1,3}\.){3}\d{1,3}$'
-        return bool(re.match(pattern, ip))
+        try:
+            ip_address(ip)
+            return True
+        except ValueError:
+            return False
+
+
+# Serialized AgentContext fields; underscore fields are internal sidecars
+_AGENT_CONTEXT_FIELDS = tuple(f.name for f in fields(AgentContext) if not f.name.startswith("_"))
 
 
 @dataclass
@@ -309,18 +342,41 @@ class SessionMemory:
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
+    # Lookup indexes over facts, kept in step with the list (see _sync_fact_indexes)
+    _by_type: Dict[str, List[Fact]] = field(default_factory=lambda: defaultdict(list), repr=False, compare=False)
+    _by_target: Dict[str, List[Fact]] = field(default_factory=lambda: defaultdict(list), repr=False, compare=False)
+    _indexed: Tuple[Optional[List[Fact]], int] = field(default=(None, 0), repr=False, compare=False)
+    
+    def _sync_fact_indexes(self):
+        """Index facts appended since the last sync; rebuild if the list was replaced or shrunk."""
+        indexed_list, count = self._indexed
+        if indexed_list is not self.facts or count > len(self.facts):
+            self._by_type.clear()
+            self._by_target.clear()
+            count = 0
+        for fact in self.facts[count:]:
+            self._by_type[fact.fact_type].append(fact)
+            self._by_target[fact.target].append(fact)
+        self._indexed = (self.facts, len(self.facts))
+    
     def add_fact(self, fact: Fact):
         """Add a fact to the session."""
+        self._sync_fact_indexes()
         self.facts.append(fact)
+        self._by_type[fact.fact_type].append(fact)
+        self._by_target[fact.target].append(fact)
+        self._indexed = (self.facts, len(self.facts))
         self.updated_at = datetime.now().isoformat()
     
     def get_facts_by_type(self, fact_type: str) -> List[Fact]:
         """Get all facts of a specific type."""
-        return [f for f in self.facts if f.fact_type == fact_type]
+        self._sync_fact_indexes()
+        return list(self._by_type.get(fact_type, ()))
     
     def get_facts_by_target(self, target: str) -> List[Fact]:
         """Get all facts related to a target."""
-        return [f for f in self.facts if f.target == target]
+        self._sync_fact_indexes()
+        return list(self._by_target.get(target, ()))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -404,7 +460,8 @@ class SessionProcessor:
     def __init__(self, 
                  redis_buffer,
                  conversation_store,
-                 vector_store):
+                 vector_store,
+                 message_writer=None):
         """
         Initialize with references to memory stores.
         
@@ -412,10 +469,13 @@ class SessionProcessor:
             redis_buffer: RedisBuffer instance
             conversation_store: ConversationStore instance
             vector_store: PgVectorStore instance
+            message_writer: Optional AsyncWriter; when set, turn messages are
+                written to PostgreSQL in the background
         """
         self.redis_buffer = redis_buffer
         self.conversation_store = conversation_store
         self.vector_store = vector_store
+        self.message_writer = message_writer
         
     def breakdown_turn(self, 
                       user_input: str, 
@@ -493,15 +553,61 @@ class SessionProcessor:
         # 1. Breakdown
         items = self.breakdown_turn(user_input, model_response, tool_outputs, context)
         
-        # 2. Persist
+        # 2. Persist (all items of the turn share one PostgreSQL transaction)
+        for item in items:
+            self._save_to_redis(item)
+        
+        if self.message_writer:
+            for item in items:
+                self.message_writer.put(item.conversation_id, item.role, item.content,
+                                        self._message_metadata(item))
+        else:
+            try:
+                self.conversation_store.add_messages(
+                    items[0].conversation_id,
+                    [{"role": item.role, "content": item.content, "metadata": self._message_metadata(item)}
+                     for item in items]
+                )
+            except Exception as e:
+                print(f"Error saving to Postgres: {e}")
+        
         for item in items:
-            self.save_item(item)
+            self._save_to_vector_store(item)
             
     def save_item(self, item: InteractionItem):
         """
         Save a single item to all memory layers.
         """
-        # Layer 1: Redis (Short-term / Fast Recall)
+        self._save_to_redis(item)
+        
+        # Layer 2: PostgreSQL (Long-term / Source of Truth)
+        try:
+            # We use the existing add_message but enrich metadata
+            self.conversation_store.add_message(
+                item.conversation_id,
+                item.role,
+                item.content,
+                metadata=self._message_metadata(item)
+            )
+        except Exception as e:
+            print(f"Error saving to Postgres: {e}")
+        
+        self._save_to_vector_store(item)
+    
+    def _message_metadata(self, item: InteractionItem) -> Dict[str, Any]:
+        """Build the PostgreSQL message metadata for an item."""
+        return {
+            "item_id": item.id,
+            "intents": item.intents,
+            "facts_count": len(item.facts),
+            "tool_outputs_count": len(item.tool_outputs),
+            # We might not store full facts/tools in msg metadata to keep it light,
+            # but for now it helps "rehydration".
+            "structured_facts": item.facts 
+        }
+    
+    def _save_to_redis(self, item: InteractionItem):
+        """Layer 1: Redis (Short-term / Fast Recall)."""
         # We store the full item dict for quick reconstruction
         try:
             # Add to message list for potential "replay" or context window
@@ -522,28 +628,9 @@ class SessionProcessor:
             )
         except Exception:
             pass # Redis is optional/cache
-            
-        # Layer 2: PostgreSQL (Long-term / Source of Truth)
-        try:
-            # We use the existing add_message but enrich metadata
-            self.conversation_store.add_message(
-                item.conversation_id,
-                item.role,
-                item.content,
-                metadata={
-                    "item_id": item.id,
-                    "intents": item.intents,
-                    "facts_count": len(item.facts),
-                    "tool_outputs_count": len(item.tool_outputs),
-                    # We might not store full facts/tools in msg metadata to keep it light,
-                    # but for now it helps "rehydration".
-                    "structured_facts": item.facts 
-                }
-            )
-        except Exception as e:
-            print(f"Error saving to Postgres: {e}")
-
-        # Layer 3: VectorDB (Semantic Search / RAG)
+    
+    def _save_to_vector_store(self, item: InteractionItem):
+        """Layer 3: VectorDB (Semantic Search / RAG)."""
         try:
             # We embed the content AND the structured facts if meaningful
             text_to_embed = item.content
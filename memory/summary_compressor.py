@@ -8,15 +8,18 @@ from models.llm_client import OllamaLLMClient
 class SummaryCompressor:
     """Compress conversation history when buffer gets too long."""
     
-    def __init__(self, max_messages: int = 50, compression_threshold: int = 100):
+    def __init__(self, max_messages: int = 50, compression_threshold: int = 100, check_interval: int = 8):
         """Initialize summary compressor.
         
         Args:
             max_messages: Maximum messages to keep in buffer before compression
             compression_threshold: Number of messages that trigger compression
+            check_interval: auto_compress_if_needed only checks every this many turns
         """
         self.max_messages = max_messages
         self.compression_threshold = compression_threshold
+        self.check_interval = check_interval
+        self._turns_since_check: Dict[str, int] = {}
         self.conversation_store = ConversationStore()
         self.model_name = "mistral:latest"  # Use Mistral for summarization (default model)
         
@@ -185,15 +188,26 @@ Create a summary that preserves all critical information for future context retr
         
         return context
     
-    def auto_compress_if_needed(self, conversation_id: str) -> bool:
+    def auto_compress_if_needed(self, conversation_id: str, force: bool = False) -> bool:
         """Automatically compress conversation if needed.
         
+        Called after every turn, but the message count is only checked every
+        check_interval turns per conversation (once over the threshold, each
+        check re-summarizes the history with the LLM).
+        
         Args:
             conversation_id: Conversation UUID
+            force: Check now regardless of check_interval
             
         Returns:
             True if compression was performed, False otherwise
         """
+        turns = self._turns_since_check.get(conversation_id, 0) + 1
+        if not force and turns < self.check_interval:
+            self._turns_since_check[conversation_id] = turns
+            return False
+        self._turns_since_check[conversation_id] = 0
+        
         message_count = self.conversation_store.get_message_count(conversation_id)
         
         if not self.should_compress(message_count):
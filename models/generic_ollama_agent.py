@@ -1,6 +1,7 @@
 """Generic Ollama agent that can work with any Ollama model."""
 
 import json
+from functools import cached_property
 from typing import Dict, Any, List, Optional, Callable
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
@@ -25,28 +26,54 @@ class GenericOllamaAgent:
             config_path: Optional path to config file
         """
         self.model_name = model_name
-        self.config = load_config(config_path) if config_path else self._load_default_config()
-        self.ollama_base_url = self.config['ollama']['base_url']
-        self.llm_client = OllamaLLMClient(
-            model_name=model_name,
+        self.prompt_template = prompt_template
+        self.config_path = config_path
+        # Config, LLM client, tool registry and templates are built on first use,
+        # so constructing an agent at startup costs nothing until it is called
+    
+    @cached_property
+    def config(self) -> Dict[str, Any]:
+        """Agent config (loaded on first access)."""
+        return load_config(self.config_path) if self.config_path else self._load_default_config()
+    
+    @property
+    def ollama_base_url(self) -> str:
+        """Ollama base URL from config."""
+        return self.config['ollama']['base_url']
+    
+    @cached_property
+    def llm_client(self) -> OllamaLLMClient:
+        """Ollama LLM client (created on first access)."""
+        return OllamaLLMClient(
+            model_name=self.model_name,
             base_url=self.ollama_base_url,
-            config_path=config_path,
+            config_path=self.config_path,
             temperature=0.3,
             top_p=0.9,
             top_k=40,
             num_predict=2048,
             repeat_penalty=1.1
         )
-        
-        self.registry = get_registry()
-        
+    
+    @cached_property
+    def registry(self):
+        """Global tool registry (resolved on first access)."""
+        return get_registry()
+    
+    @cached_property
+    def env(self) -> Environment:
+        """Jinja environment for prompt templates."""
         template_dir = Path(__file__).parent.parent / "prompts"
-        self.env = Environment(loader=FileSystemLoader(str(template_dir)))
+        return Environment(loader=FileSystemLoader(str(template_dir)))
+    
+    @cached_property
+    def system_prompt_template(self):
+        """System prompt template, falling back to the base autogen prompt."""
         try:
-            self.system_prompt_template = self.env.get_template(prompt_template)
+            return self.env.get_template(self.prompt_template)
         except:
             # Fallback to base autogen prompt
-            self.system_prompt_template = self.env.get_template("autogen_recon.jinja2")
+            return self.env.get_template("autogen_recon.jinja2")
     
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default config."""
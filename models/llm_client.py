@@ -287,9 +287,16 @@ class OllamaEmbeddingClient:
             print(f"Error embedding query: {e}")
             return []
     
+    # Inputs per /api/embed request
+    MAX_BATCH_SIZE = 256
+    
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed multiple documents.
         
+        Uses the batch /api/embed endpoint (one request per MAX_BATCH_SIZE
+        texts); falls back to one /api/embeddings request per text on Ollama
+        versions without it.
+        
         Args:
             texts: List of texts to embed
             
@@ -297,7 +304,37 @@ class OllamaEmbeddingClient:
             List of embedding vectors
         """
         embeddings = []
-        for text in texts:
-            embedding = self.embed_query(text)
-            embeddings.append(embedding)
+        for start in range(0, len(texts), self.MAX_BATCH_SIZE):
+            batch = texts[start:start + self.MAX_BATCH_SIZE]
+            batch_embeddings = self._embed_batch(batch)
+            if batch_embeddings is None:
+                batch_embeddings = [self.embed_query(text) for text in batch]
+            embeddings.extend(batch_embeddings)
         return embeddings
+    
+    def _embed_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embed texts with a single /api/embed request.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Embedding vectors in input order, or None if the batch call failed
+        """
+        url = f"{self.base_url}/api/embed"
+        
+        try:
+            response = requests.post(
+                url,
+                json={"model": self.model_name, "input": texts},
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            embeddings = response.json().get("embeddings")
+            if not isinstance(embeddings, list) or len(embeddings) != len(texts):
+                return None
+            return embeddings
+            
+        except Exception:
+            return None
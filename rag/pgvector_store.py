@@ -12,6 +12,16 @@ from typing import List, Dict, Any, Optional
 import json
 from rag.embeddings import NemotronEmbeddings
 
+# Optional: faster JSON encoding for metadata
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Column types accepted for PGVECTOR_EMBEDDING_TYPE ("halfvec" needs pgvector >= 0.7)
+EMBEDDING_TYPES = ("vector", "halfvec")
+
 
 class PgVectorStore:
     """PostgreSQL vector store using pgvector extension.
@@ -33,6 +43,14 @@ class PgVectorStore:
         self.embedding_dimension = embedding_dimension
         self.embeddings = NemotronEmbeddings()
         
+        # halfvec stores 16-bit floats: half the table/index size at negligible recall loss
+        self.embedding_type = os.getenv("PGVECTOR_EMBEDDING_TYPE", "vector").lower()
+        if self.embedding_type not in EMBEDDING_TYPES:
+            raise ValueError(
+                f"Unsupported PGVECTOR_EMBEDDING_TYPE '{self.embedding_type}'. "
+                f"Use one of: {', '.join(EMBEDDING_TYPES)}"
+            )
+        
         # PostgreSQL connection settings
         self.postgres_host = os.getenv("POSTGRES_HOST", "localhost")
         self.postgres_port = int(os.getenv("POSTGRES_PORT", "5432"))
@@ -40,6 +58,10 @@ class PgVectorStore:
         self.postgres_user = os.getenv("POSTGRES_USER", "firestarter_ad")
         self.postgres_password = os.getenv("POSTGRES_PASSWORD", "")
         
+        # Access methods of the ANN indexes on the embedding table ('hnsw', 'ivfflat');
+        # search-time knobs are only sent for indexes that exist
+        self.index_methods: set = set()
+        
         # Ensure table exists on initialization
         self._ensure_table_exists()
     
@@ -64,18 +86,34 @@ class PgVectorStore:
             cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
             
             # Create vector_embeddings table if not exists
-            cursor.execute("""
+            # embedding_type is validated in __init__, so it is safe to interpolate
+            cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS vector_embeddings (
                     id VARCHAR(255) PRIMARY KEY,
                     conversation_id VARCHAR(255),
                     collection_name VARCHAR(255) NOT NULL,
                     text TEXT NOT NULL,
-                    embedding vector(%s) NOT NULL,
+                    embedding {self.embedding_type}(%s) NOT NULL,
                     metadata JSONB,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """, (self.embedding_dimension,))
             
+            # An existing table keeps its column type; queries and the index opclass must match it
+            cursor.execute("""
+                SELECT t.typname
+                FROM pg_attribute a JOIN pg_type t ON t.oid = a.atttypid
+                WHERE a.attrelid = 'vector_embeddings'::regclass AND a.attname = 'embedding'
+            """)
+            row = cursor.fetchone()
+            if row and row[0] in EMBEDDING_TYPES and row[0] != self.embedding_type:
+                import warnings
+                warnings.warn(
+                    f"PGVECTOR_EMBEDDING_TYPE is '{self.embedding_type}' but vector_embeddings.embedding "
+                    f"is '{row[0]}'; using '{row[0]}' (see docs/POSTGRESQL_SETUP.md to migrate)"
+                )
+                self.embedding_type = row[0]
+            
             # Create indexes for better performance
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_vector_embeddings_collection 
@@ -88,12 +126,25 @@ class PgVectorStore:
                 WHERE conversation_id IS NOT NULL
             """)
             
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_vector_embeddings_embedding 
-                ON vector_embeddings USING ivfflat (embedding vector_cosine_ops)
+            index_name = "idx_vector_embeddings_embedding"
+            if self.embedding_type != "vector":
+                index_name += f"_{self.embedding_type}"
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS {index_name} 
+                ON vector_embeddings USING ivfflat (embedding {self.embedding_type}_cosine_ops)
                 WITH (lists = 100)
             """)
             
+            cursor.execute("""
+                SELECT DISTINCT am.amname
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                JOIN pg_am am ON am.oid = c.relam
+                WHERE i.indrelid = 'vector_embeddings'::regclass
+                  AND am.amname IN ('hnsw', 'ivfflat')
+            """)
+            self.index_methods = {row[0] for row in cursor.fetchall()}
+            
             conn.commit()
             cursor.close()
         except Exception as e:
@@ -149,6 +200,21 @@ class PgVectorStore:
             except Exception:
                 return
         
+        self.add_embeddings(texts, embeddings, metadatas, ids)
+    
+    def add_embeddings(self,
+                       texts: List[str],
+                       embeddings: List[List[float]],
+                       metadatas: Optional[List[Dict[str, Any]]] = None,
+                       ids: Optional[List[str]] = None):
+        """Store precomputed embeddings.
+        
+        Args:
+            texts: Texts the embeddings were computed from
+            embeddings: Embedding vectors (one per text; empty ones are skipped)
+            metadatas: List of metadata dicts (one per text)
+            ids: List of document IDs (auto-generated if not provided)
+        """
         # Filter out empty embeddings
         valid_embeddings = []
         valid_texts = []
@@ -189,10 +255,10 @@ class PgVectorStore:
                 # Convert embedding to PostgreSQL vector format
                 embedding_str = '[' + ','.join(map(str, embedding)) + ']'
                 
-                cursor.execute("""
+                cursor.execute(f"""
                     INSERT INTO vector_embeddings 
                     (id, conversation_id, collection_name, text, embedding, metadata)
-                    VALUES (%s, %s, %s, %s, %s::vector, %s::jsonb)
+                    VALUES (%s, %s, %s, %s, %s::{self.embedding_type}, %s::jsonb)
                     ON CONFLICT (id) DO UPDATE SET
                         text = EXCLUDED.text,
                         embedding = EXCLUDED.embedding,
@@ -203,7 +269,7 @@ class PgVectorStore:
                     self.collection_name,
                     text,
                     embedding_str,
-                    json.dumps(metadata)
+                    orjson.dumps(metadata).decode() if orjson is not None else json.dumps(metadata)
                 ))
             
             conn.commit()
@@ -215,16 +281,43 @@ class PgVectorStore:
         finally:
             conn.close()
     
+    def _set_search_params(self, cursor, ef_search: Optional[int], probes: Optional[int]):
+        """Apply ANN search settings for the current transaction only.
+        
+        A setting is sent only when an index it affects exists, and both go in
+        one statement, so searches without a matching index pay no round trip.
+        
+        Args:
+            cursor: Cursor whose transaction runs the search
+            ef_search: hnsw.ef_search value (skipped if None or no HNSW index)
+            probes: ivfflat.probes value (skipped if None or no ivfflat index)
+        """
+        settings = []
+        if ef_search is not None and "hnsw" in self.index_methods:
+            settings.append(("hnsw.ef_search", int(ef_search)))
+        if probes is not None and "ivfflat" in self.index_methods:
+            settings.append(("ivfflat.probes", int(probes)))
+        if not settings:
+            return
+        cursor.execute(
+            "SELECT " + ", ".join("set_config(%s, %s, true)" for _ in settings),
+            [value for name, number in settings for value in (name, str(number))]
+        )
+    
     def similarity_search(self, 
                          query: str,
                          k: int = 5,
-                         filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+                         filter: Optional[Dict[str, Any]] = None,
+                         ef_search: Optional[int] = None,
+                         probes: Optional[int] = None) -> List[Dict[str, Any]]:
         """Perform similarity search.
         
         Args:
             query: Search query text
             k: Number of results to return
             filter: Metadata filter dict (e.g., {"conversation_id": "...", "type": "..."})
+            ef_search: HNSW candidate list size for this search only (server default if None)
+            probes: ivfflat lists scanned for this search only (server default if None)
             
         Returns:
             List of similar documents with metadata and distance scores
@@ -294,27 +387,7 @@ class PgVectorStore:
                 warnings.warn(f"Failed to format embedding vector: {str(e)}")
                 return []
             
-            # Build WHERE clause for filters
-            where_clauses = ["collection_name = %s"]
-            params = [self.collection_name]
-            
-            if filter:
-                for key, value in filter.items():
-                    if key == 'conversation_id':
-                        if not (self.collection_name.startswith("conversation_") and 
-                                str(value) in self.collection_name):
-                            where_clauses.append("conversation_id = %s")
-                            params.append(value)
-                    elif key == 'session_id':
-                        if not self.collection_name.startswith("conversation_"):
-                            where_clauses.append("metadata->>%s = %s")
-                            params.extend([key, str(value)])
-                    else:
-                        # Use JSONB path query for metadata fields
-                        where_clauses.append(f"metadata->>%s = %s")
-                        params.extend([key, str(value)])
-            
-            where_sql = " AND ".join(where_clauses)
+            where_sql, params = self._build_where(filter)
             
             # IMPORTANT: Parameter order must match the SQL query structure:
             # 1. First %s in SELECT is for distance calculation (embedding_str)
@@ -326,19 +399,20 @@ class PgVectorStore:
             complete_params.append(embedding_str)  # Then: ORDER BY
             complete_params.append(k)  # Finally: LIMIT
             
-            query_sql = """
+            query_sql = f"""
                 SELECT 
                     id,
                     conversation_id,
                     text,
                     metadata,
-                    1 - (embedding <=> %s::vector) as distance
+                    1 - (embedding <=> %s::{self.embedding_type}) as distance
                 FROM vector_embeddings
-                WHERE """ + where_sql + """
-                ORDER BY embedding <=> %s::vector
+                WHERE """ + where_sql + f"""
+                ORDER BY embedding <=> %s::{self.embedding_type}
                 LIMIT %s
             """
             
+            self._set_search_params(cursor, ef_search, probes)
             cursor.execute(query_sql, complete_params)
             rows = cursor.fetchall()
             cursor.close()
@@ -361,6 +435,121 @@ class PgVectorStore:
         finally:
             conn.close()
     
+    def _build_where(self, filter: Optional[Dict[str, Any]] = None):
+        """Build the WHERE clause restricting a search to this collection.
+        
+        Args:
+            filter: Metadata filter dict (see similarity_search)
+            
+        Returns:
+            (where_sql, params) tuple
+        """
+        where_clauses = ["collection_name = %s"]
+        params = [self.collection_name]
+        
+        if filter:
+            for key, value in filter.items():
+                if key == 'conversation_id':
+                    if not (self.collection_name.startswith("conversation_") and 
+                            str(value) in self.collection_name):
+                        where_clauses.append("conversation_id = %s")
+                        params.append(value)
+                elif key == 'session_id':
+                    if not self.collection_name.startswith("conversation_"):
+                        where_clauses.append("metadata->>%s = %s")
+                        params.extend([key, str(value)])
+                else:
+                    # Use JSONB path query for metadata fields
+                    where_clauses.append(f"metadata->>%s = %s")
+                    params.extend([key, str(value)])
+        
+        return " AND ".join(where_clauses), params
+    
+    def similarity_search_batch(self,
+                                queries: List[str],
+                                k: int = 5,
+                                filter: Optional[Dict[str, Any]] = None,
+                                ef_search: Optional[int] = None,
+                                probes: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """Perform several similarity searches with one embedding call and one query.
+        
+        Args:
+            queries: Search query texts
+            k: Number of results per query
+            filter: Metadata filter dict applied to every query
+            ef_search: HNSW candidate list size for this search only (server default if None)
+            probes: ivfflat lists scanned for this search only (server default if None)
+            
+        Returns:
+            One result list per query, in input order (same format as similarity_search)
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if not queries:
+            return results
+        
+        try:
+            query_embeddings = self.embeddings.embed_documents(queries)
+        except Exception as e:
+            import warnings
+            warnings.warn(f"Batch embedding generation failed: {str(e)}")
+            return results
+        
+        # Queries whose embedding failed just get no results
+        indexes = []
+        embedding_strs = []
+        for i, emb in enumerate(query_embeddings or []):
+            if isinstance(emb, (list, tuple)) and emb:
+                try:
+                    embedding_strs.append('[' + ','.join(str(float(x)) for x in emb) + ']')
+                    indexes.append(i)
+                except (ValueError, TypeError):
+                    continue
+        if not indexes:
+            return results
+        
+        where_sql, params = self._build_where(filter)
+        # One round trip: a LATERAL top-k search per query embedding
+        query_sql = f"""
+            WITH q(idx, emb) AS (
+                SELECT * FROM unnest(%s::int[], %s::text[])
+            )
+            SELECT q.idx, r.id, r.conversation_id, r.text, r.metadata, r.distance
+            FROM q CROSS JOIN LATERAL (
+                SELECT 
+                    id,
+                    conversation_id,
+                    text,
+                    metadata,
+                    1 - (embedding <=> q.emb::{self.embedding_type}) as distance
+                FROM vector_embeddings
+                WHERE """ + where_sql + f"""
+                ORDER BY embedding <=> q.emb::{self.embedding_type}
+                LIMIT %s
+            ) r
+            ORDER BY q.idx, r.distance DESC
+        """
+        
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            self._set_search_params(cursor, ef_search, probes)
+            cursor.execute(query_sql, [indexes, embedding_strs] + params + [k])
+            for row in cursor.fetchall():
+                results[row['idx']].append({
+                    "document": row['text'],
+                    "metadata": dict(row['metadata']) if row['metadata'] else {},
+                    "distance": float(row['distance']) if row['distance'] is not None else None,
+                    "id": str(row['id'])
+                })
+            cursor.close()
+        except Exception as e:
+            import warnings
+            warnings.warn(f"Batch similarity search failed: {str(e)}")
+        finally:
+            conn.close()
+        
+        return results
+    
     def delete_collection(self):
         """Delete all embeddings in this collection.
         
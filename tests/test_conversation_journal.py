@@ -0,0 +1,28 @@
+"""Tests for ConversationJournal truncation."""
+
+import os
+
+from memory.conversation_journal import ConversationJournal
+
+
+def test_committed_journal_is_removed(tmp_path):
+    journal = ConversationJournal(str(tmp_path))
+    entry_id = journal.append("conv", "user", "hello")
+    path = journal._path("conv")
+    assert os.path.exists(path)
+
+    journal.mark_persisted("conv", [entry_id])
+
+    assert not os.path.exists(path)
+    assert journal.pending("conv") == []
+
+
+def test_partially_committed_journal_keeps_pending_entries(tmp_path):
+    journal = ConversationJournal(str(tmp_path))
+    journal.append("conv", "user", "first")
+    second = journal.append("conv", "user", "second")
+
+    journal.mark_persisted("conv", [second])
+
+    assert os.path.exists(journal._path("conv"))
+    assert [m["content"] for m in journal.pending("conv")] == ["first"]
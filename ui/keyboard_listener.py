@@ -1,5 +1,6 @@
 """Keyboard listener for real-time panel toggle."""
 
+import os
 import sys
 import threading
 import select
@@ -7,7 +8,11 @@ from typing import Optional, Callable
 
 
 class KeyboardListener:
-    """Non-blocking keyboard input listener."""
+    """Background keyboard input listener for interactive terminals.
+    
+    The listener thread blocks in select() until a key arrives or stop()
+    writes to an internal wake-up pipe, so it never polls while idle.
+    """
     
     def __init__(self, on_key_press: Optional[Callable[[str], None]] = None):
         """Initialize keyboard listener.
@@ -19,6 +24,8 @@ class KeyboardListener:
         self.running = False
         self.thread: Optional[threading.Thread] = None
         self._original_terminal_settings = None
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
     
     def start(self):
         """Start listening for keyboard input."""
@@ -26,24 +33,41 @@ class KeyboardListener:
             return
         
         self.running = True
+        self._wake_r, self._wake_w = os.pipe()
         self.thread = threading.Thread(target=self._listen, daemon=True)
         self.thread.start()
     
     def stop(self):
         """Stop listening for keyboard input."""
         self.running = False
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
         if self.thread:
             self.thread.join(timeout=0.1)
+            self.thread = None
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._wake_r = self._wake_w = None
     
     def _listen(self):
         """Listen for keyboard input in background thread."""
-        # Use select for non-blocking input check
         # Note: This works best when stdin is available and not redirected
+        wake_r = self._wake_r
         while self.running:
             try:
-                # Check if stdin has data (non-blocking, 0.1s timeout)
+                # Block until stdin has data or stop() signals the wake-up pipe
                 # This won't interfere with Rich Live display
-                ready, _, _ = select.select([sys.stdin], [], [], 0.1)
+                ready, _, _ = select.select([sys.stdin, wake_r], [], [])
+                
+                if wake_r in ready:
+                    break
                 
                 if ready:
                     try:
@@ -62,3 +86,22 @@ class KeyboardListener:
             except KeyboardInterrupt:
                 # User interrupted, stop listening
                 break
+
+
+class NoopKeyboardListener:
+    """Keyboard listener stand-in for non-interactive runs (no thread)."""
+    
+    def __init__(self, on_key_press: Optional[Callable[[str], None]] = None):
+        """Initialize no-op listener.
+        
+        Args:
+            on_key_press: Ignored; accepted for interface compatibility
+        """
+        self.on_key_press = on_key_press
+        self.running = False
+    
+    def start(self):
+        """Do nothing; there is no terminal to listen to."""
+    
+    def stop(self):
+        """Do nothing; no thread was started."""
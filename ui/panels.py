@@ -94,13 +94,15 @@ class ToolExecutionPanel:
 class ModelResponsePanel:
     """Panel for displaying model responses with streaming."""
     
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, title: Optional[str] = None):
         """Initialize model response panel.
         
         Args:
             model_name: Name of the model
+            title: Panel title (default: "Model: <model_name>")
         """
         self.model_name = model_name
+        self.title = title
         self.response_text = ""
         self.status = "Thinking..."
         self.expanded = True 
@@ -164,7 +166,7 @@ class ModelResponsePanel:
         
         content = "\n".join(content_lines)
         
-        title = f"[blue]Model: {self.model_name}[/blue]"
+        title = f"[blue]{self.title or f'Model: {self.model_name}'}[/blue]"
         if self.response_text:
             total_lines = len(self.response_text.split('\n'))
             if total_lines > self.max_collapsed_lines:
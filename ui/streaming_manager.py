@@ -1,6 +1,8 @@
 """Streaming manager for coordinating live updates."""
 
-from typing import Dict, Optional, Callable, Any
+import os
+import threading
+from typing import Dict, List, Optional, Callable, Any, Union
 from rich.console import Console, Group
 from rich.live import Live
 from rich.layout import Layout
@@ -8,18 +10,24 @@ from rich.panel import Panel
 
 from ui.panels import ToolExecutionPanel, ModelResponsePanel, ProgressPanel
 from ui.components import TargetInfoCard, FindingCard, AnalysisCard
-from ui.keyboard_listener import KeyboardListener
+from ui.keyboard_listener import KeyboardListener, NoopKeyboardListener
 
 
 class StreamingManager:
     """Manages streaming events and panel updates."""
     
-    def __init__(self, console: Optional[Console] = None, enable_keyboard: bool = True):
+    def __init__(self,
+                 console: Optional[Console] = None,
+                 enable_keyboard: bool = True,
+                 stream_batching_interval_ms: int = 20):
         """Initialize streaming manager.
         
         Args:
             console: Rich console instance. Creates new if None.
-            enable_keyboard: Enable keyboard listener for expand/collapse
+            enable_keyboard: Enable keyboard listener for expand/collapse.
+                Always disabled when the CI environment variable is set.
+            stream_batching_interval_ms: How long streamed model chunks and tool
+                output lines are coalesced before a re-render (0 disables batching)
         """
         self.console = console or Console()
         self.tool_panels: Dict[str, ToolExecutionPanel] = {}
@@ -28,8 +36,17 @@ class StreamingManager:
         self.progress_panel = ProgressPanel()
         self.live: Optional[Live] = None
         self.layout: Optional[Layout] = None
-        self.keyboard_listener: Optional[KeyboardListener] = None
-        self.enable_keyboard = enable_keyboard
+        self.keyboard_listener: Optional[Union[KeyboardListener, NoopKeyboardListener]] = None
+        self.enable_keyboard = enable_keyboard and not os.environ.get("CI")
+        # Non-interactive runs get a listener that never spawns a thread
+        self._listener_cls = KeyboardListener if self.enable_keyboard else NoopKeyboardListener
+        
+        # Streamed text is buffered per panel and applied in one render per interval
+        self.stream_batching_interval_ms = stream_batching_interval_ms
+        self._pending_model_chunks: Dict[str, List[str]] = {}
+        self._pending_tool_lines: Dict[str, List[str]] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
     
     def start(self):
         """Start live display and keyboard listener."""
@@ -39,11 +56,13 @@ class StreamingManager:
         
         self._update_display()
         
-        if self.enable_keyboard and not self.keyboard_listener:
+        if not self.keyboard_listener:
             self._start_keyboard_listener()
     
     def stop(self):
         """Stop live display and keyboard listener."""
+        self.flush_pending()
+        
         if self.keyboard_listener:
             self.keyboard_listener.stop()
             self.keyboard_listener = None
@@ -69,14 +88,16 @@ class StreamingManager:
             Panel ID
         """
         panel_id = f"{tool_name}:{command_name}" if command_name else tool_name
-        if panel_id not in self.tool_panels:
-            self.tool_panels[panel_id] = ToolExecutionPanel(
-                tool_name=tool_name,
-                command_name=command_name,
-                target=target,
-                parameters=parameters
-            )
-            self._update_display()
+        # Panel dicts are iterated by the flush timer thread; mutate them under the lock
+        with self._lock:
+            if panel_id not in self.tool_panels:
+                self.tool_panels[panel_id] = ToolExecutionPanel(
+                    tool_name=tool_name,
+                    command_name=command_name,
+                    target=target,
+                    parameters=parameters
+                )
+                self._update_display()
         return panel_id
     
     def set_tool_result(self, panel_id: str, result: Dict[str, Any]):
@@ -98,8 +119,7 @@ class StreamingManager:
             line: Output line
         """
         if panel_id in self.tool_panels:
-            self.tool_panels[panel_id].add_output(line)
-            self._update_display()
+            self._queue_stream_text(self._pending_tool_lines, panel_id, line)
     
     def update_tool_status(self, panel_id: str, status: str):
         """Update tool status.
@@ -124,19 +144,21 @@ class StreamingManager:
             self.tool_panels[panel_id].update_status(status)
             self._update_display()
     
-    def create_model_panel(self, model_name: str) -> str:
+    def create_model_panel(self, model_name: str, title: Optional[str] = None) -> str:
         """Create a model response panel.
         
         Args:
             model_name: Model name
+            title: Optional panel title (default: "Model: <model_name>")
             
         Returns:
             Panel ID
         """
         panel_id = model_name
-        if panel_id not in self.model_panels:
-            self.model_panels[panel_id] = ModelResponsePanel(model_name=model_name)
-        self._update_display()
+        with self._lock:
+            if panel_id not in self.model_panels:
+                self.model_panels[panel_id] = ModelResponsePanel(model_name=model_name, title=title)
+            self._update_display()
         return panel_id
     
     def toggle_model_panel(self, panel_id: str):
@@ -153,28 +175,30 @@ class StreamingManager:
         """Start keyboard listener for expand/collapse."""
         def handle_key(key: str):
             """Handle keyboard input."""
-            key_lower = key.lower()
-            
-            # Toggle all model panels
-            if key_lower == 'e':  # Expand
-                for panel_id in self.model_panels:
-                    panel = self.model_panels[panel_id]
-                    if not panel.expanded:
-                        panel.toggle_expand()
-                        self._update_display()
-            elif key_lower == 'c':  # Collapse
-                for panel_id in self.model_panels:
-                    panel = self.model_panels[panel_id]
-                    if panel.expanded:
-                        panel.toggle_expand()
-                        self._update_display()
-            elif key_lower == 't':  # Toggle
-                if self.model_panels:
+            # Runs on the listener thread; iterate the panels under the lock
+            with self._lock:
+                key_lower = key.lower()
+                
+                # Toggle all model panels
+                if key_lower == 'e':  # Expand
+                    for panel_id in self.model_panels:
+                        panel = self.model_panels[panel_id]
+                        if not panel.expanded:
+                            panel.toggle_expand()
+                            self._update_display()
+                elif key_lower == 'c':  # Collapse
                     for panel_id in self.model_panels:
-                        self.model_panels[panel_id].toggle_expand()
-                    self._update_display()
+                        panel = self.model_panels[panel_id]
+                        if panel.expanded:
+                            panel.toggle_expand()
+                            self._update_display()
+                elif key_lower == 't':  # Toggle
+                    if self.model_panels:
+                        for panel_id in self.model_panels:
+                            self.model_panels[panel_id].toggle_expand()
+                        self._update_display()
         
-        self.keyboard_listener = KeyboardListener(on_key_press=handle_key)
+        self.keyboard_listener = self._listener_cls(on_key_press=handle_key)
         self.keyboard_listener.start()
     
     def stream_model_response(self, panel_id: str, chunk: str):
@@ -185,8 +209,32 @@ class StreamingManager:
             chunk: Response chunk
         """
         if panel_id in self.model_panels:
-            self.model_panels[panel_id].add_chunk(chunk)
-            self._update_display()
+            self._queue_stream_text(self._pending_model_chunks, panel_id, chunk)
+    
+    def has_model_output(self, panel_id: str) -> bool:
+        """Check whether a model panel has received any streamed text.
+        
+        Args:
+            panel_id: Panel ID
+            
+        Returns:
+            True if the panel exists and has response text
+        """
+        return bool(self.get_model_output(panel_id))
+    
+    def get_model_output(self, panel_id: str) -> str:
+        """Get the text streamed into a model panel so far.
+        
+        Args:
+            panel_id: Panel ID
+            
+        Returns:
+            Response text ("" if the panel does not exist)
+        """
+        with self._lock:
+            self._apply_pending()
+            panel = self.model_panels.get(panel_id)
+            return panel.response_text if panel else ""
     
     def update_model_status(self, panel_id: str, status: str):
         """Update model status.
@@ -253,8 +301,9 @@ class StreamingManager:
         """
         card = TargetInfoCard(self.console)
         panel = card.render(domain, company_info)
-        self.info_panels.append(panel)
-        self._update_display()
+        with self._lock:
+            self.info_panels.append(panel)
+            self._update_display()
         
     def show_finding(self, finding_type: str, data: Dict[str, Any], severity: str = None):
         """Show finding card.
@@ -266,8 +315,9 @@ class StreamingManager:
         """
         card = FindingCard(self.console)
         panel = card.render(finding_type, data, severity)
-        self.info_panels.append(panel)
-        self._update_display()
+        with self._lock:
+            self.info_panels.append(panel)
+            self._update_display()
         
     def log_message(self, message: str, style: str = "dim"):
         """Print a static message safely while live display is running.
@@ -289,14 +339,66 @@ class StreamingManager:
         """
         card = AnalysisCard(self.console)
         panel = card.render(analysis)
-        self.info_panels.append(panel)
-        self._update_display()
+        with self._lock:
+            self.info_panels.append(panel)
+            self._update_display()
+    
+    def _queue_stream_text(self, pending: Dict[str, List[str]], panel_id: str, text: str):
+        """Buffer streamed text and make sure a flush is scheduled.
+        
+        Args:
+            pending: Pending buffer (model chunks or tool lines)
+            panel_id: Panel ID
+            text: Chunk or line to buffer
+        """
+        with self._lock:
+            pending.setdefault(panel_id, []).append(text)
+            if self.stream_batching_interval_ms <= 0:
+                self._update_display()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.stream_batching_interval_ms / 1000.0, self.flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush_pending(self):
+        """Apply all buffered stream text now with a single re-render."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._pending_model_chunks or self._pending_tool_lines:
+                self._update_display()
+    
+    def _apply_pending(self):
+        """Move buffered stream text into its panels (caller holds the lock)."""
+        if self._pending_model_chunks:
+            for panel_id, chunks in self._pending_model_chunks.items():
+                panel = self.model_panels.get(panel_id)
+                if panel:
+                    panel.add_chunk("".join(chunks))
+            self._pending_model_chunks.clear()
+        if self._pending_tool_lines:
+            for panel_id, lines in self._pending_tool_lines.items():
+                panel = self.tool_panels.get(panel_id)
+                if panel:
+                    for line in lines:
+                        panel.add_output(line)
+            self._pending_tool_lines.clear()
     
     def _update_display(self):
-        """Update the live display."""
-        if not self.live:
-            return
+        """Update the live display.
         
+        Any buffered stream text is applied first, so every non-streaming
+        update (progress, status, completion) also flushes immediately.
+        """
+        with self._lock:
+            self._apply_pending()
+            if not self.live:
+                return
+            self._render_live()
+    
+    def _render_live(self):
+        """Rebuild the live renderable from all panels."""
         renderables = []
         
         def get_recent(panels, count=3):
@@ -324,11 +426,14 @@ class StreamingManager:
     
     def clear(self):
         """Clear all panels."""
-        self.tool_panels.clear()
-        self.model_panels.clear()
-        self.info_panels.clear()
-        self.progress_panel = ProgressPanel()
-        self._update_display()
+        with self._lock:
+            self._pending_model_chunks.clear()
+            self._pending_tool_lines.clear()
+            self.tool_panels.clear()
+            self.model_panels.clear()
+            self.info_panels.clear()
+            self.progress_panel = ProgressPanel()
+            self._update_display()
     
     def get_tool_callback(self, panel_id: str) -> Callable[[str], None]:
         """Get a callback function for tool output streaming.
@@ -32,6 +32,9 @@ class InputNormalizer:
         self.interactive_callback = interactive_callback
         self.ai_model = ai_model  # For semantic understanding (no hardcode)
         
+        # domain -> verified/corrected domain, so a target is only searched once per session
+        self._dns_cache: Dict[str, Optional[str]] = {}
+        
         # IP address pattern (with optional spaces)
         self.ip_pattern = re.compile(
             r'\b(\d{1,3})\s*\.\s*(\d{1,3})\s*\.\s*(\d{1,3})\s*\.\s*(\d{1,3})\b'
@@ -657,6 +660,20 @@ If no target found, return: {{"has_target": false, "potential_targets": []}}"""
         if not self.search_aggregator:
             return domain
         
+        key = domain.lower()
+        if key not in self._dns_cache:
+            self._dns_cache[key] = self._verify_and_correct_dns(domain)
+        return self._dns_cache[key]
+    
+    def _verify_and_correct_dns(self, domain: str) -> Optional[str]:
+        """Verify and correct DNS name using web search (uncached).
+        
+        Args:
+            domain: Domain name to verify
+            
+        Returns:
+            Corrected domain name or None if not found
+        """
         # Check if domain looks suspicious (has unusual characters or patterns)
         if not self._looks_like_valid_domain(domain):
             return self._search_and_correct_domain(domain)
@@ -0,0 +1,70 @@
+"""
+Normalization Result Cache
+
+LRU + TTL cache in front of InputNormalizer.normalize_input. Normalization may
+call an LLM and run web/DNS verification, so repeated prompts (retries,
+re-asks after a correction) are served from memory instead.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+
+class NormalizeCache:
+    """Caching wrapper exposing the same normalize_input API as InputNormalizer."""
+
+    def __init__(self, normalizer, maxsize: int = 512, ttl_seconds: float = 3600.0):
+        """Initialize normalization cache.
+
+        Args:
+            normalizer: InputNormalizer instance to delegate misses to
+            maxsize: Maximum number of cached prompts (least recently used evicted first)
+            ttl_seconds: Seconds a cached result stays valid
+        """
+        self.normalizer = normalizer
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, bool], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalize_input(self, user_input: str, verify_domains: bool = True) -> Dict[str, Any]:
+        """Normalize input, reusing a cached result for the same prompt.
+
+        Prompts are keyed case- and whitespace-insensitively together with
+        verify_domains.
+
+        Args:
+            user_input: Raw user input
+            verify_domains: Whether domains are verified via web search
+
+        Returns:
+            Normalization result dict (see InputNormalizer.normalize_input)
+        """
+        key = (user_input.strip().lower(), verify_domains)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return dict(result)
+                del self._entries[key]
+
+        result = self.normalizer.normalize_input(user_input, verify_domains=verify_domains)
+
+        with self._lock:
+            self._entries[key] = (now, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return dict(result)
+
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
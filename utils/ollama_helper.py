@@ -1,11 +1,20 @@
 """Utility functions for Ollama model management."""
 
+import os
+import json
+import time
+import tempfile
 import requests
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import yaml
 
 
+# Installed models rarely change between sessions, so the list is cached on disk
+MODELS_CACHE_PATH = Path.home() / ".cache" / "firestarter" / "models.json"
+MODELS_CACHE_TTL = 300  # seconds
+
+
 def get_ollama_base_url() -> str:
     """Get Ollama base URL from config or environment."""
     try:
@@ -54,15 +63,68 @@ def list_ollama_models(base_url: Optional[str] = None) -> List[Dict[str, Any]]:
         return []
 
 
-def get_model_names(base_url: Optional[str] = None) -> List[str]:
+def _read_models_cache(base_url: str) -> Optional[List[str]]:
+    """Read cached model names if the cache is fresh and for the same server.
+    
+    Args:
+        base_url: Ollama base URL the cache must belong to
+        
+    Returns:
+        Cached model names, or None on miss
+    """
+    try:
+        if MODELS_CACHE_PATH.stat().st_mtime <= time.time() - MODELS_CACHE_TTL:
+            return None
+        with open(MODELS_CACHE_PATH, 'r') as f:
+            data = json.load(f)
+        if data.get('base_url') != base_url:
+            return None
+        return list(data.get('models', []))
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_models_cache(base_url: str, model_names: List[str]):
+    """Atomically write model names to the cache file.
+    
+    Args:
+        base_url: Ollama base URL the names came from
+        model_names: Model names to cache
+    """
+    try:
+        MODELS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=MODELS_CACHE_PATH.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'base_url': base_url, 'models': model_names}, f)
+            os.replace(tmp_path, MODELS_CACHE_PATH)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass  # Cache is best effort
+
+
+def get_model_names(base_url: Optional[str] = None, refresh: bool = False) -> List[str]:
     """Get list of model names from Ollama.
     
+    Results are cached in MODELS_CACHE_PATH for MODELS_CACHE_TTL seconds.
+    
     Args:
         base_url: Ollama base URL (defaults to config)
+        refresh: Ignore the cache and query Ollama
         
     Returns:
         List of model names (e.g., ['mistral:latest', 'llama3.1:8b'])
     """
+    if base_url is None:
+        base_url = get_ollama_base_url()
+    
+    if not refresh:
+        cached = _read_models_cache(base_url)
+        if cached is not None:
+            return cached
+    
     models = list_ollama_models(base_url)
     model_names = []
     
@@ -72,7 +134,11 @@ def get_model_names(base_url: Optional[str] = None) -> List[str]:
         if name:
             model_names.append(name)
     
-    return sorted(model_names)
+    model_names.sort()
+    # An empty list usually means Ollama is unreachable; don't pin that for 5 minutes
+    if model_names:
+        _write_models_cache(base_url, model_names)
+    return model_names
 
 
 def check_model_exists(model_name: str, base_url: Optional[str] = None) -> bool: